@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import argparse
+import itertools
 import json
+import os
 import random
-from dataclasses import dataclass, asdict
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import ItemsView, ValuesView
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields, replace
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple, Union
 
 import networkx as nx
+import numpy as np
+
+from instance_profile import Profiler
+
+# Node id: decimal string labels (default) or integer ids (``int_ids=True``)
+NodeId = Union[str, int]
 
 
 @dataclass(frozen=True)
@@ -18,44 +32,279 @@ class GridSpec:
     directed: bool = True
 
 
-def create_graph(spec: GridSpec) -> Tuple[Dict[Tuple[int, int], str], nx.DiGraph]:
+# (row, col) steps to the 4-neighbourhood, in CSR adjacency order
+_GRID_STEPS: Tuple[Tuple[int, int], ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+@dataclass
+class GridCSR:
+    """
+    Array-based (CSR) 4-neighbourhood grid.
+
+    Node ``u`` sits at ``(x[u], y[u]) = (row, col)``, with
+    ``u = row * spec.cols + col``; its out-arcs are
+    ``targets[offsets[u]:offsets[u + 1]]`` with lengths the same slice of
+    ``length``. Both directions of every lattice edge are stored, also for
+    undirected specs.
+    """
+    spec: GridSpec
+    offsets: np.ndarray                # (n + 1,) int64
+    targets: np.ndarray                # (m,) int32
+    x: np.ndarray                      # (n,) int32, row of each node
+    y: np.ndarray                      # (n,) int32, column of each node
+    length: np.ndarray                 # (m,) float64
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.x)
+
+    @property
+    def num_arcs(self) -> int:
+        return len(self.targets)
+
+    def node_id(self, row: int, col: int) -> int:
+        return row * self.spec.cols + col
+
+    def neighbors(self, u: int) -> np.ndarray:
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def sources(self) -> np.ndarray:
+        """(m,) int32 source node of every arc, aligned with ``targets``."""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.offsets))
+
+    def coord_to_id(self, int_ids: bool = False) -> Dict[Tuple[int, int], NodeId]:
+        label = int if int_ids else str
+        return {(r, c): label(u) for u, (r, c) in enumerate(zip(self.x.tolist(), self.y.tolist()))}
+
+    def to_networkx(self, int_ids: bool = False) -> Tuple[Dict[Tuple[int, int], NodeId], nx.DiGraph]:
+        """Return the ``(coord_to_id, G)`` pair of ``create_graph``."""
+        G = nx.DiGraph() if self.spec.directed else nx.Graph()
+        G.graph["geo"] = False
+        coord_to_id = self.coord_to_id(int_ids)
+        for (r, c), nid in coord_to_id.items():
+            G.add_node(nid, x=r, y=c)
+        label = int if int_ids else str
+        G.add_edges_from(
+            (label(u), label(v), {"length": length})
+            for u, v, length in zip(self.sources().tolist(), self.targets.tolist(), self.length.tolist())
+        )
+        return coord_to_id, G
+
+
+def build_grid_csr(spec: GridSpec) -> GridCSR:
+    """Build the CSR grid of ``spec`` in closed form, without networkx."""
+    n = spec.rows * spec.cols
+    ids = np.arange(n, dtype=np.int64)
+    x, y = ids // spec.cols, ids % spec.cols
+
+    # (n, 4) candidate targets, -1 where the step leaves the grid
+    cand = np.full((n, len(_GRID_STEPS)), -1, dtype=np.int64)
+    for k, (dr, dc) in enumerate(_GRID_STEPS):
+        r, c = x + dr, y + dc
+        inside = (r >= 0) & (r < spec.rows) & (c >= 0) & (c < spec.cols)
+        cand[inside, k] = r[inside] * spec.cols + c[inside]
+    valid = cand >= 0
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=offsets[1:])
+    targets = cand[valid].astype(np.int32)
+    return GridCSR(
+        spec=spec,
+        offsets=offsets,
+        targets=targets,
+        x=x.astype(np.int32),
+        y=y.astype(np.int32),
+        length=np.full(len(targets), spec.edge_length, dtype=np.float64),
+    )
+
+
+@dataclass(frozen=True)
+class ImplicitGrid:
+    """
+    Zero-storage 4-neighbourhood grid: the same nodes and arcs as
+    ``build_grid_csr(spec)``, answered arithmetically from ``spec``.
+
+    Node ``u`` is at ``(row, col) = divmod(u, spec.cols)``; node labels are
+    ``str(u)``, as in ``create_graph``.
+    """
+    spec: GridSpec
+
+    @property
+    def num_nodes(self) -> int:
+        return self.spec.rows * self.spec.cols
+
+    @property
+    def num_arcs(self) -> int:
+        # Each lattice edge in both directions
+        rows, cols = self.spec.rows, self.spec.cols
+        return 2 * (rows * (cols - 1) + cols * (rows - 1))
+
+    def __contains__(self, u: object) -> bool:
+        # NumPy integers (e.g. from GridCSR arrays) are node ids, bools are not
+        return isinstance(u, (int, np.integer)) and not isinstance(u, bool) and 0 <= u < self.num_nodes
+
+    def node_id(self, row: int, col: int) -> int:
+        if not (0 <= row < self.spec.rows and 0 <= col < self.spec.cols):
+            raise ValueError(f"({row}, {col}) is outside a {self.spec.rows}x{self.spec.cols} grid")
+        return row * self.spec.cols + col
+
+    def coord(self, u: int) -> Tuple[int, int]:
+        if u not in self:
+            raise ValueError(f"node {u!r} is outside a {self.spec.rows}x{self.spec.cols} grid")
+        return divmod(int(u), self.spec.cols)
+
+    def label(self, u: int) -> str:
+        self.coord(u)
+        return str(int(u))
+
+    def node_of(self, label: str) -> int:
+        u = int(label)
+        self.coord(u)
+        return u
+
+    def neighbors(self, u: int) -> List[int]:
+        """Successors of ``u`` in ``GridCSR`` adjacency order."""
+        r, c = self.coord(u)
+        return [
+            (r + dr) * self.spec.cols + (c + dc)
+            for dr, dc in _GRID_STEPS
+            if 0 <= r + dr < self.spec.rows and 0 <= c + dc < self.spec.cols
+        ]
+
+    def has_arc(self, u: int, v: int) -> bool:
+        if u not in self or v not in self:
+            return False
+        (ru, cu), (rv, cv) = divmod(int(u), self.spec.cols), divmod(int(v), self.spec.cols)
+        return abs(ru - rv) + abs(cu - cv) == 1
+
+    def arc_length(self, u: int, v: int) -> float:
+        if not self.has_arc(u, v):
+            raise ValueError(f"no arc {u!r} -> {v!r}")
+        return self.spec.edge_length
+
+    def manhattan(self, u: int, v: int) -> int:
+        """Number of arcs on a shortest path from ``u`` to ``v``."""
+        (ru, cu), (rv, cv) = self.coord(u), self.coord(v)
+        return abs(ru - rv) + abs(cu - cv)
+
+    def to_csr(self) -> GridCSR:
+        return build_grid_csr(self.spec)
+
+
+# Tie-breaking policies of GridPathOracle.paths
+PATH_POLICIES = ("row_first", "col_first", "staircase", "diagonal")
+
+
+@dataclass(frozen=True)
+class GridPathOracle:
+    """
+    Vectorized shortest paths on the 4-neighbourhood grid of ``spec``.
+
+    Shortest paths on the lattice are exactly the monotone paths, so
+    distances are Manhattan distances and a path is fixed by the order of
+    its row and column moves, chosen by a tie-breaking policy:
+
+    - "row_first": all row moves, then all column moves;
+    - "col_first": all column moves, then all row moves;
+    - "staircase": alternate row and column moves while both remain;
+    - "diagonal": stay closest to the straight line between the endpoints.
+
+    Queries take arrays of node ids (``row * cols + col``) and are answered
+    with array arithmetic, without building the graph.
     """
-    Build a directed graph from a 2‑D lattice and return a node id mapping,
-    the directed graph, and its (edge‑)dual graph as a line graph.
+    spec: GridSpec
+
+    def coords(self, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if nodes.size and (nodes.min() < 0 or nodes.max() >= self.spec.rows * self.spec.cols):
+            raise ValueError(f"node ids outside a {self.spec.rows}x{self.spec.cols} grid")
+        return np.divmod(nodes, self.spec.cols)
+
+    def distances(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """Number of arcs on a shortest path for each origin/destination pair."""
+        (r0, c0), (r1, c1) = self.coords(origins), self.coords(destinations)
+        return np.abs(r1 - r0) + np.abs(c1 - c0)
+
+    def distance_matrix(self, nodes: np.ndarray) -> np.ndarray:
+        """All-pairs arc counts between ``nodes``, shape (len(nodes), len(nodes))."""
+        r, c = self.coords(nodes)
+        return np.abs(r[:, None] - r[None, :]) + np.abs(c[:, None] - c[None, :])
+
+    def paths(self, origins: np.ndarray, destinations: np.ndarray,
+              policy: str = "staircase") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Shortest paths for a batch of origin/destination pairs.
+
+        Returns
+        -------
+        tuple
+            (offsets, nodes): path ``i`` is ``nodes[offsets[i]:offsets[i + 1]]``,
+            from origin to destination inclusive (the layout of ``GridCSR``);
+            ``nodes`` is int32 unless the batch or grid needs int64.
+        """
+        if policy not in PATH_POLICIES:
+            raise ValueError(f"unknown policy {policy!r}; expected one of {PATH_POLICIES}")
+        (r0, c0), (r1, c1) = self.coords(origins), self.coords(destinations)
+        n_rows, n_cols = np.abs(r1 - r0), np.abs(c1 - c0)
+        steps = n_rows + n_cols
+        offsets = np.zeros(len(steps) + 1, dtype=np.int64)
+        np.cumsum(steps + 1, out=offsets[1:])
+
+        # Step index k along each path and the per-path values, flattened
+        # (int32 temporaries when they fit: this is memory-bound)
+        small = offsets[-1] < 2 ** 31 and self.spec.rows * self.spec.cols < 2 ** 30
+        itype = np.int32 if small else np.int64
+        path = np.repeat(np.arange(len(steps), dtype=itype), steps + 1)
+        k = np.arange(offsets[-1], dtype=itype) - offsets[:-1].astype(itype)[path]
+        dr, dc, total = n_rows.astype(itype)[path], n_cols.astype(itype)[path], steps.astype(itype)[path]
+
+        # Row moves among the first k moves; the others are column moves
+        if policy == "row_first":
+            row_moves = np.minimum(k, dr)
+        elif policy == "col_first":
+            row_moves = np.maximum(k - dc, 0)
+        elif policy == "staircase":
+            m = np.minimum(dr, dc)
+            row_moves = np.where(k <= 2 * m, (k + 1) // 2, np.where(dr > dc, k - m, m))
+        else:
+            # 2 * k * dr overflows int32 on long paths
+            row_moves = ((2 * k.astype(np.int64) * dr + total) // np.maximum(2 * total, 1)).astype(itype)
+
+        nodes = _monotone_nodes(itype(self.spec.cols), r0.astype(itype)[path], c0.astype(itype)[path],
+                                np.sign(r1 - r0).astype(itype)[path], np.sign(c1 - c0).astype(itype)[path],
+                                k, row_moves)
+        return offsets, nodes
+
+    def path(self, origin: int, destination: int, policy: str = "staircase") -> List[int]:
+        _, nodes = self.paths(np.array([origin]), np.array([destination]), policy)
+        return nodes.tolist()
+
+
+def create_graph(spec: GridSpec, int_ids: bool = False) -> Tuple[Dict[Tuple[int, int], NodeId], nx.DiGraph]:
+    """
+    Build a directed graph from a 2‑D lattice and return a node id mapping
+    and the directed graph.
     
-    Node labels are strings of consecutive integers to match the user's path lists.
+    Node labels are strings of consecutive integers to match the user's path lists,
+    or the integers themselves with ``int_ids=True``.
+    The lattice is built with ``build_grid_csr``; use it directly to avoid
+    networkx on large grids.
     
     Parameters
     ----------
     spec : GridSpec
         Grid and edge settings.
+    int_ids : bool
+        Label nodes with ints instead of decimal strings.
     
     Returns
     -------
     tuple
-        (coord_to_id, G, dual_G)
-        - coord_to_id: maps (row, col) -> node_id as string
+        (coord_to_id, G)
+        - coord_to_id: maps (row, col) -> node_id (string, or int with ``int_ids``)
         - G: directed graph with 'x','y' node attributes and 'length' edge attribute
     """
-    # Base undirected lattice (4‑neighborhood)
-    lattice = nx.grid_2d_graph(spec.rows, spec.cols)
-    G = nx.DiGraph() if spec.directed else nx.Graph()
-    G.graph["geo"] = False
-
-    # Assign integer string IDs in a stable order and store coordinates
-    coord_to_id: Dict[Tuple[int, int], str] = {}
-    for i, (r, c) in enumerate(lattice.nodes):
-        nid = str(i)
-        coord_to_id[(r, c)] = nid
-        G.add_node(nid, x=r, y=c)
-
-    # Add symmetric arcs with a 'length' attribute
-    for u_coord, v_coord in lattice.edges:
-        u, v = coord_to_id[u_coord], coord_to_id[v_coord]
-        G.add_edge(u, v, length=spec.edge_length)
-        G.add_edge(v, u, length=spec.edge_length)
-
-    return coord_to_id, G
+    return build_grid_csr(spec).to_networkx(int_ids)
 
 
 # Predefined flight (scheduled take-off time, horizontal path)
@@ -68,6 +317,201 @@ BASE_FLIGHTS: Dict[str, Tuple[int, List[str]]] = {
 }
 
 
+def int_node_ids(base_flights: Dict[str, Tuple[int, List[NodeId]]]) -> Dict[str, Tuple[int, List[int]]]:
+    """
+    Base flight templates with integer node ids (e.g. ``int_node_ids(BASE_FLIGHTS)``).
+    Flights, ``Sep_Nodes`` and ``FlightTable`` built from them carry ints,
+    matching ``create_graph(spec, int_ids=True)``.
+    """
+    return {fid: (t0, [int(n) for n in path]) for fid, (t0, path) in base_flights.items()}
+
+
+def _monotone_nodes(cols: int, r0: int | np.ndarray, c0: int | np.ndarray, dr: int | np.ndarray,
+                    dc: int | np.ndarray, k: np.ndarray, row_moves: np.ndarray) -> np.ndarray:
+    # Node k of the monotone path leaving (r0, c0) in row/column directions (dr, dc),
+    # after row_moves row moves among its first k moves; scalars or arrays
+    return (r0 + dr * row_moves) * cols + c0 + dc * (k - row_moves)
+
+
+def _monotone_path(grid: ImplicitGrid, u: int, v: int, winding: float, rng: random.Random) -> List[int]:
+    # Shortest lattice path u -> v; at each step, switch axis with probability ``winding``.
+    # Only the order of the moves is random: nodes are placed as in GridPathOracle.paths
+    (r, c), (r1, c1) = grid.coord(u), grid.coord(v)
+    left = [abs(r1 - r), abs(c1 - c)]
+    axis = rng.randrange(2) if all(left) else int(left[1] > 0)
+    row_moves = [0]
+    while left[0] or left[1]:
+        if left[1 - axis] and (not left[axis] or rng.random() < winding):
+            axis = 1 - axis
+        left[axis] -= 1
+        row_moves.append(row_moves[-1] + (axis == 0))
+    k = np.arange(len(row_moves))
+    return _monotone_nodes(grid.spec.cols, r, c, (r1 > r) - (r1 < r), (c1 > c) - (c1 < c),
+                           k, np.array(row_moves)).tolist()
+
+
+def _erase_loop(path: List[int], position: Dict[int, int], node: int) -> None:
+    # Append node to a simple path, cutting the loop back to an earlier visit
+    if node in position:
+        for n in path[position[node] + 1:]:
+            del position[n]
+        del path[position[node] + 1:]
+    else:
+        position[node] = len(path)
+        path.append(node)
+
+
+def _biased_walk(grid: ImplicitGrid, u: int, v: int, bias: float, max_steps: int,
+                 winding: float, rng: random.Random) -> List[int]:
+    # Random walk stepping toward v with probability ``bias``, finished by a
+    # monotone path after max_steps; loops are erased so no node repeats
+    rows, cols = grid.spec.rows, grid.spec.cols
+    r1, c1 = divmod(v, cols)
+    path = [u]
+    position = {u: 0}
+    node = u
+    for _ in range(max_steps):
+        if node == v:
+            break
+        r, c = divmod(node, cols)
+        if rng.random() < bias:
+            # Steps that reduce the Manhattan distance to v
+            steps = [(r + (r1 > r) - (r1 < r), c)] if r != r1 else []
+            if c != c1:
+                steps.append((r, c + (c1 > c) - (c1 < c)))
+        else:
+            steps = [(r + dr, c + dc) for dr, dc in _GRID_STEPS if 0 <= r + dr < rows and 0 <= c + dc < cols]
+        r, c = rng.choice(steps)
+        node = r * cols + c
+        _erase_loop(path, position, node)
+    if node != v:
+        for n in _monotone_path(grid, node, v, winding, rng)[1:]:
+            _erase_loop(path, position, n)
+    return path
+
+
+# Uniform pair draws tried per template before switching to _far_pair_sampler
+_PAIR_ATTEMPTS = 100
+
+
+def _far_pair_sampler(rows: int, cols: int, min_length: int):
+    """
+    Draw ``(u, v)`` uniformly among the node pairs at least ``min_length``
+    arcs apart, without rejection: the row distance ``a`` is drawn in
+    proportion to its number of valid pairs, then the column distance
+    (at least ``min_length - a``), then the rows and columns at those
+    distances. Builds per-distance pair counts of length ``rows`` and
+    ``cols``.
+    """
+    def ordered_pairs(n: int) -> List[int]:
+        # Ordered position pairs at distance d on a line of n
+        return [n] + [2 * (n - d) for d in range(1, n)]
+
+    row_pairs, col_pairs = ordered_pairs(rows), ordered_pairs(cols)
+    col_tail = list(itertools.accumulate(reversed(col_pairs)))[::-1] + [0]   # pairs at distance >= d
+    need = [min(max(min_length - a, 0), cols) for a in range(rows)]          # column distance needed
+    row_weights = [row_pairs[a] * col_tail[need[a]] for a in range(rows)]
+
+    def line_pair(n: int, d: int, rng: random.Random) -> Tuple[int, int]:
+        # Uniform ordered pair of positions d apart on a line of n
+        x = rng.randrange(n - d)
+        return (x, x + d) if rng.random() < 0.5 else (x + d, x)
+
+    def draw(rng: random.Random) -> Tuple[int, int]:
+        a = rng.choices(range(rows), weights=row_weights)[0]
+        b = rng.choices(range(need[a], cols), weights=col_pairs[need[a]:])[0]
+        (r, r1), (c, c1) = line_pair(rows, a, rng), line_pair(cols, b, rng)
+        return r * cols + c, r1 * cols + c1
+
+    return draw
+
+
+def random_flight_templates(
+    grid: GridSpec | ImplicitGrid,
+    n_flights: int,
+    seed: int | None = None,
+    method: str = "shortest",
+    winding: float = 0.5,
+    bias: float = 0.7,
+    min_length: int = 2,
+    max_dep_time: int = 60,
+    int_ids: bool = False,
+) -> Dict[str, Tuple[int, List[NodeId]]]:
+    """
+    Random base flight templates in the format of ``BASE_FLIGHTS``, for use
+    as ``base_flights`` by the generators.
+
+    Origin/destination pairs are drawn uniformly among the nodes at least
+    ``min_length`` arcs apart (by rejection, or by a draw conditioned on
+    the distance when such pairs are rare) and departure times uniformly in
+    ``[0, max_dep_time]``. Paths are computed on an ``ImplicitGrid``, with
+    no graph built.
+
+    Parameters
+    ----------
+    grid : GridSpec or ImplicitGrid
+        Grid the paths live on (node ids as in ``create_graph``).
+    n_flights : int
+        Number of templates, keyed ``D1`` .. ``D{n_flights}``.
+    seed : int, optional
+        Seed of the ``random.Random`` generator; equal seeds give equal templates.
+    method : {"shortest", "walk"}
+        "shortest" draws a shortest (monotone) path; "walk" a loop-erased
+        random walk that steps toward the destination with probability
+        ``bias``, so paths may detour.
+    winding : float
+        Probability of turning at each step of a monotone path, between 0
+        (a single turn) and 1 (a staircase, like the winding reference flights).
+    bias : float
+        Probability that a "walk" step moves toward the destination.
+    min_length : int
+        Minimum number of arcs between origin and destination.
+    max_dep_time : int
+        Latest scheduled take-off time.
+    int_ids : bool
+        Label nodes with ints instead of decimal strings.
+    """
+    if method not in ("shortest", "walk"):
+        raise ValueError(f"unknown method {method!r}; expected 'shortest' or 'walk'")
+    grid = grid if isinstance(grid, ImplicitGrid) else ImplicitGrid(grid)
+    if min_length > grid.spec.rows + grid.spec.cols - 2:
+        raise ValueError(f"no node pair is {min_length} arcs apart on a {grid.spec.rows}x{grid.spec.cols} grid")
+    rng = random.Random(seed)
+    label = int if int_ids else str
+
+    templates: Dict[str, Tuple[int, List[NodeId]]] = {}
+    far_pair = None
+    while len(templates) < n_flights:
+        for _ in range(_PAIR_ATTEMPTS):
+            u, v = rng.randrange(grid.num_nodes), rng.randrange(grid.num_nodes)
+            if grid.manhattan(u, v) >= min_length:
+                break
+        else:
+            if far_pair is None:
+                far_pair = _far_pair_sampler(grid.spec.rows, grid.spec.cols, min_length)
+            u, v = far_pair(rng)
+        distance = grid.manhattan(u, v)
+        if method == "shortest":
+            path = _monotone_path(grid, u, v, winding, rng)
+        else:
+            path = _biased_walk(grid, u, v, bias, 4 * distance, winding, rng)
+        templates[f"D{len(templates) + 1}"] = (rng.randint(0, max_dep_time), [label(n) for n in path])
+    return templates
+
+
+def _str_node_ids(record: Dict[str, object]) -> Dict[str, object]:
+    # Integer node ids are written as strings, so saved files do not depend on the id mode
+    if not isinstance(record["dep"], int):
+        return record
+    return {
+        **record,
+        "dep": str(record["dep"]),
+        "arr": str(record["arr"]),
+        "path": [str(n) for n in record["path"]],
+        "node_times": [{**nt, "node": str(nt["node"])} for nt in record["node_times"]],
+    }
+
+
 @dataclass(frozen=True)
 class TimingParams:
     edge_length: float                 # length per edge (consistent units)
@@ -80,8 +524,247 @@ class TimingParams:
     latest_climb_levels: int = 2       # levels climbed for latest timestamps
 
 
-def _piecewise_offset(rep_index: int) -> int:
-    return rep_index * 60
+# Type of each TimingParams field (annotations are strings under postponed evaluation)
+TIMING_FIELD_TYPES = {f.name: {"float": float, "int": int}[f.type] for f in fields(TimingParams)}
+
+
+@dataclass(frozen=True)
+class FleetTiming:
+    """
+    Timing parameters of several drone classes.
+
+    Base flight ``b`` (in template order) and all its repetitions fly as
+    class ``class_of[b]`` and reference its parameters through
+    ``params_ref`` ``"P{class_of[b]}"``. The vectorized generators read
+    each field as an array over classes (``column``), gathered per flight.
+    Tables loaded from files keep ``class_of`` empty and store the class of
+    every flight instead (``FlightTable.timing_class``).
+    """
+    classes: Tuple[TimingParams, ...]
+    class_of: Tuple[int, ...] = ()     # class index of each base flight
+
+    @classmethod
+    def mixed(cls,
+              classes: Iterable[TimingParams],
+              n_flights: int,
+              weights: Iterable[float] | None = None,
+              seed: int | None = None) -> "FleetTiming":
+        """Assign a class to each of ``n_flights`` base flights at random, in proportion to ``weights``."""
+        classes = tuple(classes)
+        p = None
+        if weights is not None:
+            p = np.asarray(list(weights), dtype=np.float64)
+            p = p / p.sum()
+        class_of = np.random.default_rng(seed).choice(len(classes), size=n_flights, p=p)
+        return cls(classes, tuple(class_of.tolist()))
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of the ``TimingParams`` field ``name``, one per class."""
+        return np.array([getattr(c, name) for c in self.classes], dtype=np.float64)
+
+
+def _timing_classes(timing: TimingParams | FleetTiming, n_base: int) -> Tuple[FleetTiming, np.ndarray]:
+    # Single parameters are one class shared by every base flight
+    if isinstance(timing, TimingParams):
+        return FleetTiming((timing,)), np.zeros(n_base, dtype=np.int64)
+    class_of = np.asarray(timing.class_of, dtype=np.int64)
+    if len(class_of) != n_base:
+        raise ValueError(f"class_of has {len(class_of)} entries for {n_base} base flights")
+    if len(class_of) and (class_of.min() < 0 or class_of.max() >= len(timing.classes)):
+        raise ValueError(f"class_of refers to classes outside 0..{len(timing.classes) - 1}")
+    return timing, class_of
+
+
+class DepartureModel(ABC):
+    """
+    Scheduled take-off times of replicated flights.
+
+    ``departure_times(repetitions, t0)`` maps the take-off times ``t0`` of
+    the base flights to an int array of shape ``(repetitions, len(t0))``.
+    Random models draw from a ``numpy.random.Generator`` seeded with their
+    ``seed`` on every call, so the same model always yields the same times,
+    on any worker. Draws are made row by row, so fewer repetitions give the
+    first rows of more: generation shards and instance families rely on it.
+    """
+
+    @abstractmethod
+    def departure_times(self, repetitions: int, t0: np.ndarray) -> np.ndarray:
+        ...
+
+
+class RepetitionOffsets(DepartureModel):
+    """
+    Deterministic models shifting every flight of repetition ``r`` by the
+    same offset: ``offsets(repetitions, n_flights, start)`` returns the int
+    offsets of repetitions ``start .. repetitions - 1``, ``n_flights`` being
+    the number of base flights released per repetition. Any range can be
+    computed on its own, which lets ``iter_flight_intentions`` stream them
+    in chunks.
+    """
+
+    @abstractmethod
+    def offsets(self, repetitions: int, n_flights: int, start: int = 0) -> np.ndarray:
+        ...
+
+    def departure_times(self, repetitions: int, t0: np.ndarray) -> np.ndarray:
+        offsets = self.offsets(repetitions, len(t0))
+        return offsets[:, None] + np.asarray(t0, dtype=np.int64)[None, :]
+
+
+def _rounded_offsets(offsets: np.ndarray) -> np.ndarray:
+    if not np.all(np.isfinite(offsets)) or (offsets.size and offsets[-1] >= 2 ** 62):
+        raise ValueError("repetition offsets overflow; use fewer repetitions or a smaller growth")
+    return np.rint(offsets).astype(np.int64)
+
+
+@dataclass(frozen=True)
+class FixedOffsets(RepetitionOffsets):
+    """Repetition ``r`` departs ``r * interval`` seconds after the reference schedule (the default)."""
+    interval: float = 60.0
+
+    def offsets(self, repetitions: int, n_flights: int, start: int = 0) -> np.ndarray:
+        return _rounded_offsets(np.arange(start, repetitions) * float(self.interval))
+
+
+@dataclass(frozen=True)
+class GeometricOffsets(RepetitionOffsets):
+    """
+    Gaps between consecutive repetitions start at ``interval`` seconds and
+    grow by ``ratio`` (or shrink, for ``ratio < 1``), so traffic thins out
+    (or piles up) over the instance.
+    """
+    interval: float = 60.0
+    ratio: float = 1.1
+
+    def offsets(self, repetitions: int, n_flights: int, start: int = 0) -> np.ndarray:
+        if self.ratio <= 0:
+            raise ValueError(f"ratio must be positive, got {self.ratio!r}")
+        r = np.arange(start, repetitions, dtype=np.float64)
+        if self.ratio == 1:
+            return _rounded_offsets(r * self.interval)
+        # Partial sums of the gaps interval * ratio**k, k < r
+        with np.errstate(over="ignore", invalid="ignore"):
+            offsets = self.interval * np.expm1(r * np.log(self.ratio)) / (self.ratio - 1)
+        return _rounded_offsets(offsets)
+
+
+@dataclass(frozen=True)
+class DensityOffsets(RepetitionOffsets):
+    """
+    Repetitions spaced so that ``flights_per_minute`` flights take off per
+    minute on average: with ``B`` base flights per repetition, repetition
+    ``r`` departs ``r * 60 * B / flights_per_minute`` seconds later.
+    """
+    flights_per_minute: float
+
+    def offsets(self, repetitions: int, n_flights: int, start: int = 0) -> np.ndarray:
+        if self.flights_per_minute <= 0:
+            raise ValueError(f"flights_per_minute must be positive, got {self.flights_per_minute!r}")
+        return _rounded_offsets(np.arange(start, repetitions) * (60.0 * n_flights / self.flights_per_minute))
+
+
+@dataclass(frozen=True)
+class Jitter(DepartureModel):
+    """
+    ``base`` departures plus independent noise per flight: uniform on
+    ``[-scale, scale]`` or normal with standard deviation ``scale``, rounded
+    to whole seconds and clipped at 0.
+    """
+    scale: float
+    seed: int
+    distribution: str = "uniform"
+    base: DepartureModel = FixedOffsets()
+
+    def departure_times(self, repetitions: int, t0: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        shape = (repetitions, len(t0))
+        if self.distribution == "uniform":
+            noise = rng.uniform(-self.scale, self.scale, shape)
+        elif self.distribution == "normal":
+            noise = rng.normal(0.0, self.scale, shape)
+        else:
+            raise ValueError(f"unknown distribution {self.distribution!r}; expected 'uniform' or 'normal'")
+        return np.maximum(self.base.departure_times(repetitions, t0) + np.rint(noise).astype(np.int64), 0)
+
+
+@dataclass(frozen=True)
+class PoissonArrivals(DepartureModel):
+    """
+    Each base flight recurs as a Poisson process starting at its reference
+    take-off time, with exponential gaps of mean ``mean_interval`` seconds,
+    so repetitions no longer depart in synchronized waves.
+    """
+    seed: int
+    mean_interval: float = 60.0
+
+    def departure_times(self, repetitions: int, t0: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        gaps = rng.exponential(self.mean_interval, (repetitions, len(t0)))
+        gaps[:1] = 0.0
+        return np.asarray(t0, dtype=np.int64)[None, :] + np.rint(np.cumsum(gaps, axis=0)).astype(np.int64)
+
+
+@dataclass(frozen=True)
+class RushHour(DepartureModel):
+    """
+    ``PoissonArrivals`` with a time-varying rate: ``profile`` gives relative
+    intensities over consecutive periods of ``period`` seconds, repeated
+    cyclically, averaging one departure per ``mean_interval`` seconds per
+    base flight, e.g. ``RushHour(seed, profile=(1, 4, 1), period=3600)``.
+    """
+    seed: int
+    profile: Tuple[float, ...] = (1.0, 3.0, 1.0)
+    period: float = 3600.0
+    mean_interval: float = 60.0
+
+    def departure_times(self, repetitions: int, t0: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        profile = np.asarray(self.profile, dtype=np.float64)
+        if len(profile) == 0 or profile.min() < 0 or profile.sum() <= 0:
+            raise ValueError("profile needs non-negative intensities with a positive sum")
+        # Unit-rate arrivals, mapped through the inverse cumulative intensity
+        gaps = rng.exponential(1.0, (repetitions, len(t0)))
+        gaps[:1] = 0.0
+        mass = np.cumsum(gaps, axis=0)
+        rates = profile / profile.mean() / self.mean_interval
+        cycle = float(rates.sum() * self.period)
+        n_cycles = int(mass.max() // cycle) + 1 if mass.size else 1
+        knots_t = np.arange(len(rates) * n_cycles + 1) * self.period
+        knots_m = np.r_[0.0, np.cumsum(np.tile(rates * self.period, n_cycles))]
+        # Zero-intensity periods give flat knots; interp then skips over them
+        offsets = np.interp(mass, knots_m, knots_t)
+        return np.asarray(t0, dtype=np.int64)[None, :] + np.rint(offsets).astype(np.int64)
+
+
+# Departure models selectable from the command line
+DEPARTURE_MODELS = ("fixed", "geometric", "density", "jitter", "poisson", "rush-hour")
+
+
+def _departure_times(repetitions: int, t0: np.ndarray, departures: DepartureModel | None,
+                     first_rep: int = 0) -> np.ndarray:
+    # (repetitions - first_rep, len(t0)) take-off times; the full model is drawn, then sliced
+    if departures is None:
+        departures = FixedOffsets()
+    return departures.departure_times(repetitions, t0)[first_rep:]
+
+
+# Repetitions per block of take-off times computed by iter_flight_intentions
+_STREAM_CHUNK = 1024
+
+
+def _departure_rows(repetitions: int, t0: np.ndarray, departures: DepartureModel | None,
+                    first_rep: int = 0) -> Iterator[np.ndarray]:
+    # Take-off time rows of repetitions first_rep .. repetitions - 1; offset models are
+    # computed _STREAM_CHUNK repetitions at a time, random models are drawn whole
+    if departures is None:
+        departures = FixedOffsets()
+    if not isinstance(departures, RepetitionOffsets):
+        yield from _departure_times(repetitions, t0, departures, first_rep)
+        return
+    t0 = np.asarray(t0, dtype=np.int64)
+    for start in range(first_rep, repetitions, _STREAM_CHUNK):
+        offsets = departures.offsets(min(start + _STREAM_CHUNK, repetitions), len(t0), start)
+        yield from offsets[:, None] + t0[None, :]
 
 
 def _cumulative_edge_times(num_edges: int, edge_length: float, v: float) -> List[float]:
@@ -89,35 +772,651 @@ def _cumulative_edge_times(num_edges: int, edge_length: float, v: float) -> List
     return [k * per_edge for k in range(num_edges + 1)]  # include k=0
 
 
+# Key of the shared entry in the top-level "TimingParams" section
+DEFAULT_PARAMS_ID = "P0"
+
+
+def timing_params_section(timing: TimingParams | FleetTiming) -> Dict[str, Dict[str, object]]:
+    """
+    Top-level "TimingParams" section referenced by flights through
+    ``params_ref``: ``"P0"``, or ``"P0"``, ``"P1"``, ... for the classes of
+    a ``FleetTiming``.
+    """
+    classes = (timing,) if isinstance(timing, TimingParams) else timing.classes
+    return {f"P{k}": asdict(c) for k, c in enumerate(classes)}
+
+
+def _params_field(params: Dict[str, object] | None, timing_class: int = 0) -> Dict[str, object]:
+    # Legacy (inline) layout copies the parameters into every flight
+    if params is not None:
+        return {"params": {**params}}
+    return {"params_ref": f"P{timing_class}"}
+
+
+def _inline_params(timing: TimingParams | FleetTiming, inline_params: bool) -> List[Dict[str, object]] | None:
+    # Inline "params" of each class, or None for the params_ref layout
+    if not inline_params:
+        return None
+    classes = (timing,) if isinstance(timing, TimingParams) else timing.classes
+    return [asdict(c) for c in classes]
+
+
+def _base_flight_arrays(base: Dict[str, Tuple[int, List[NodeId]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (scheduled take-off times, path lengths) of the base flights as arrays."""
+    t0 = np.fromiter((t for t, _ in base.values()), dtype=np.int64, count=len(base))
+    lengths = np.fromiter((len(p) for _, p in base.values()), dtype=np.int64, count=len(base))
+    return t0, lengths
+
+
+def node_time_windows(
+    repetitions: int,
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+    first_rep: int = 0,
+    departures: DepartureModel | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized earliest/latest node timestamps for every replicated flight.
+
+    The fast/slow cumulative profiles are computed once per base flight and
+    broadcast across all repetitions, which only shift them by their
+    take-off times (``60 * r`` seconds after the reference schedule,
+    unless ``departures`` gives another model).
+
+    Parameters
+    ----------
+    repetitions : int
+        Number of replications of the base flights.
+    timing : TimingParams or FleetTiming
+        Shared timing parameters, or parameters per class of base flight.
+    base_flights : dict, optional
+        Base flight templates; defaults to ``BASE_FLIGHTS``.
+    first_rep : int
+        Only compute repetitions ``first_rep .. repetitions - 1``.
+    departures : DepartureModel, optional
+        Take-off time model; defaults to ``FixedOffsets()``.
+
+    Returns
+    -------
+    tuple
+        (dep_time, t_min, t_max)
+        - dep_time: int array of shape (repetitions - first_rep, flights)
+        - t_min, t_max: float arrays of shape (repetitions - first_rep, flights, path_len),
+          where path_len is the longest base path; entries past the end of a
+          shorter path are NaN.
+    """
+    base = BASE_FLIGHTS if base_flights is None else base_flights
+    t0, lengths = _base_flight_arrays(base)
+    path_len = int(lengths.max()) if len(base) else 0
+
+    # Per base flight parameters, gathered from the per class arrays
+    fleet, class_of = _timing_classes(timing, len(base))
+    edge_length, v_min, v_max, ground_delay_max, climb_time, earliest, latest = (
+        fleet.column(name)[class_of] for name in ("edge_length", "v_min", "v_max", "ground_delay_max",
+                                                  "climb_time_per_level", "earliest_climb_levels",
+                                                  "latest_climb_levels"))
+
+    k = np.arange(path_len, dtype=np.float64)
+    cum_fast = k[None, :] * (edge_length / v_max)[:, None]
+    cum_slow = k[None, :] * (edge_length / v_min)[:, None]
+    cum_fast = np.where(k[None, :] < lengths[:, None], cum_fast, np.nan)
+    cum_slow = np.where(k[None, :] < lengths[:, None], cum_slow, np.nan)
+
+    dep_time = _departure_times(repetitions, t0, departures, first_rep)
+    t_sched = dep_time.astype(np.float64)
+    t0_min = t_sched + earliest * climb_time
+    t0_max = t_sched + ground_delay_max + latest * climb_time
+
+    t_min = t0_min[:, :, None] + cum_fast[None, :, :]
+    t_max = t0_max[:, :, None] + cum_slow[None, :, :]
+    return dep_time, t_min, t_max
+
+
+@dataclass
+class FlightTable:
+    """
+    Columnar (struct-of-arrays) flight intentions.
+
+    Flight ``i`` has id ``D{flight_idx[i]}``; its path is
+    ``node_labels[path_nodes[path_offsets[i]:path_offsets[i + 1]]]`` and its
+    node timestamps are the same slice of ``t_min`` / ``t_max``. The timing
+    parameters are stored once for the whole table; with a ``FleetTiming``,
+    ``timing_class`` holds the class of each flight.
+    """
+    node_labels: List[NodeId]          # node id for each node index
+    flight_idx: np.ndarray             # (n,) int64, numeric part of the flight id
+    dep_time: np.ndarray               # (n,) int64, scheduled take-off time
+    dep: np.ndarray                    # (n,) int32, departure node index
+    arr: np.ndarray                    # (n,) int32, arrival node index
+    path_offsets: np.ndarray           # (n + 1,) int64, offsets into the flat arrays
+    path_nodes: np.ndarray             # (total,) int32, node index along each path
+    t_min: np.ndarray                  # (total,) float64, earliest timestamps
+    t_max: np.ndarray                  # (total,) float64, latest timestamps
+    timing: TimingParams | FleetTiming
+    timing_class: np.ndarray | None = None   # (n,) int16, class of each flight (FleetTiming only)
+
+    def __len__(self) -> int:
+        return len(self.flight_idx)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the array columns."""
+        columns = [self.flight_idx, self.dep_time, self.dep, self.arr,
+                   self.path_offsets, self.path_nodes, self.t_min, self.t_max]
+        if self.timing_class is not None:
+            columns.append(self.timing_class)
+        return sum(a.nbytes for a in columns)
+
+    def head(self, n: int) -> "FlightTable":
+        """The first ``n`` flights, as views of these arrays."""
+        end = int(self.path_offsets[n])
+        return FlightTable(
+            node_labels=self.node_labels,
+            flight_idx=self.flight_idx[:n],
+            dep_time=self.dep_time[:n],
+            dep=self.dep[:n],
+            arr=self.arr[:n],
+            path_offsets=self.path_offsets[:n + 1],
+            path_nodes=self.path_nodes[:end],
+            t_min=self.t_min[:end],
+            t_max=self.t_max[:end],
+            timing=self.timing,
+            timing_class=None if self.timing_class is None else self.timing_class[:n],
+        )
+
+    def flight_ids(self) -> List[str]:
+        return [f"D{i}" for i in self.flight_idx.tolist()]
+
+    def record(self, i: int, inline_params: bool = False) -> Dict[str, object]:
+        """Return flight ``i`` in the dict layout of ``generate_flight_intentions``."""
+        return self._record(i, self._class_params(inline_params))
+
+    def _class_params(self, inline_params: bool) -> List[Dict[str, object]] | None:
+        return _inline_params(self.timing, inline_params)
+
+    def _record(self, i: int, params: List[Dict[str, object]] | None) -> Dict[str, object]:
+        return _RowBlock.decode(self, i, i + 1).record(0, params)
+
+    def _blocks(self) -> Iterator["_RowBlock"]:
+        for start in range(0, len(self), _DECODE_BLOCK):
+            yield _RowBlock.decode(self, start, min(start + _DECODE_BLOCK, len(self)))
+
+    def _records(self, params: List[Dict[str, object]] | None) -> Iterator[Tuple[str, Dict[str, object]]]:
+        # (flight_id, record) pairs in row order, decoded a block at a time
+        for block in self._blocks():
+            for j, idx in enumerate(block.flight_idx):
+                yield f"D{idx}", block.record(j, params)
+
+    def to_dict(self, inline_params: bool = False) -> Dict[str, Dict[str, object]]:
+        """Expand the table into the dict layout of ``generate_flight_intentions``."""
+        return dict(self._records(self._class_params(inline_params)))
+
+    @classmethod
+    def from_dict(cls, F: Dict[str, Dict[str, object]],
+                  timing: TimingParams | FleetTiming | None = None) -> "FlightTable":
+        """
+        Build a table from dict-layout flight intentions. Flight ids must be of
+        the form ``D<int>``. ``timing`` defaults to the distinct inline params
+        of the flights (one class each) and is required for the shared
+        ``params_ref`` layout.
+        """
+        if timing is None:
+            classes: Dict[Tuple[Tuple[str, object], ...], TimingParams] = {}
+            for rec in F.values():
+                if not isinstance(rec.get("params"), dict):
+                    raise ValueError("timing is required when F carries no inline params")
+                key = tuple(sorted(rec["params"].items()))
+                if key not in classes:
+                    classes[key] = TimingParams(**rec["params"])
+            if not classes:
+                raise ValueError("timing is required when F carries no inline params")
+            timing = next(iter(classes.values())) if len(classes) == 1 else FleetTiming(tuple(classes.values()))
+
+        timing_class = None
+        if isinstance(timing, FleetTiming):
+            refs = {f"P{k}": k for k in range(len(timing.classes))}
+            keys = {tuple(sorted(asdict(c).items())): k for k, c in enumerate(timing.classes)}
+            try:
+                timing_class = np.array([refs[rec["params_ref"]] if "params_ref" in rec
+                                         else keys[tuple(sorted(rec["params"].items()))]
+                                         for rec in F.values()], dtype=np.int16)
+            except KeyError as exc:
+                raise ValueError(f"flight parameters match no timing class: {exc}") from None
+
+        index: Dict[NodeId, int] = {}
+        node_labels: List[NodeId] = []
+
+        def node_index(node: NodeId) -> int:
+            if node not in index:
+                index[node] = len(node_labels)
+                node_labels.append(node)
+            return index[node]
+
+        flight_idx, dep_time, dep, arr, lengths = [], [], [], [], []
+        path_nodes: List[int] = []
+        t_min: List[float] = []
+        t_max: List[float] = []
+        for fid, rec in F.items():
+            flight_idx.append(int(fid[1:]))
+            dep_time.append(rec["dep_time"])
+            dep.append(node_index(rec["dep"]))
+            arr.append(node_index(rec["arr"]))
+            lengths.append(len(rec["node_times"]))
+            for nt in rec["node_times"]:
+                path_nodes.append(node_index(nt["node"]))
+                t_min.append(nt["t_min"])
+                t_max.append(nt["t_max"])
+
+        path_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=path_offsets[1:])
+        return cls(
+            node_labels=node_labels,
+            flight_idx=np.asarray(flight_idx, dtype=np.int64),
+            dep_time=np.asarray(dep_time, dtype=np.int64),
+            dep=np.asarray(dep, dtype=np.int32),
+            arr=np.asarray(arr, dtype=np.int32),
+            path_offsets=path_offsets,
+            path_nodes=np.asarray(path_nodes, dtype=np.int32),
+            t_min=np.asarray(t_min, dtype=np.float64),
+            t_max=np.asarray(t_max, dtype=np.float64),
+            timing=timing,
+            timing_class=timing_class,
+        )
+
+
+# Rows converted to Python objects at once when decoding records of a FlightTable
+_DECODE_BLOCK = 1024
+
+
+@dataclass(frozen=True)
+class _RowBlock:
+    """
+    Rows ``start .. start + len(flight_idx) - 1`` of a ``FlightTable`` as
+    Python lists, converted with one ``tolist()`` per column instead of one
+    NumPy scalar per value; ``offsets`` index ``path`` and the time lists.
+    """
+    start: int
+    flight_idx: List[int]
+    dep: List[NodeId]
+    arr: List[NodeId]
+    dep_time: List[int]
+    timing_class: List[int] | None
+    offsets: List[int]
+    path: List[NodeId]
+    t_min: List[float]
+    t_max: List[float]
+
+    @classmethod
+    def decode(cls, table: FlightTable, start: int, stop: int) -> "_RowBlock":
+        offsets = table.path_offsets[start:stop + 1]
+        lo, hi = int(offsets[0]), int(offsets[-1])
+        labels = table.node_labels
+        return cls(
+            start=start,
+            flight_idx=table.flight_idx[start:stop].tolist(),
+            dep=[labels[n] for n in table.dep[start:stop].tolist()],
+            arr=[labels[n] for n in table.arr[start:stop].tolist()],
+            dep_time=table.dep_time[start:stop].tolist(),
+            timing_class=None if table.timing_class is None else table.timing_class[start:stop].tolist(),
+            offsets=(offsets - lo).tolist(),
+            path=[labels[n] for n in table.path_nodes[lo:hi].tolist()],
+            t_min=table.t_min[lo:hi].tolist(),
+            t_max=table.t_max[lo:hi].tolist(),
+        )
+
+    def record(self, j: int, params: List[Dict[str, object]] | None) -> Dict[str, object]:
+        """Row ``start + j`` in the dict layout of ``generate_flight_intentions``."""
+        lo, hi = self.offsets[j], self.offsets[j + 1]
+        path = self.path[lo:hi]
+        k = 0 if self.timing_class is None else self.timing_class[j]
+        return {
+            "dep": self.dep[j],
+            "arr": self.arr[j],
+            "dep_time": self.dep_time[j],
+            "path": path,
+            **_params_field(None if params is None else params[k], k),
+            "node_times": [
+                {"node": node, "t_min": a, "t_max": b}
+                for node, a, b in zip(path, self.t_min[lo:hi], self.t_max[lo:hi])
+            ],
+        }
+
+
+class FlightView(Mapping[str, Dict[str, object]]):
+    """
+    Read-only ``flight_id -> record`` mapping over a ``FlightTable``.
+
+    Records have the dict layout of ``generate_flight_intentions`` and are
+    decoded from the arrays on each access, so a memory-mapped table only
+    pages in the flights that are actually looked up, and a generated one
+    never holds all its records. Rows are converted to Python objects a
+    block at a time and the last few blocks are kept, so sequential and
+    sorted-id lookups (as by ``save_results_as_json``) cost about what the
+    pure-Python engine spends building each record.
+    """
+
+    # Decoded row blocks kept for lookups
+    _CACHED_BLOCKS = 8
+
+    def __init__(self, table: FlightTable, inline_params: bool = False) -> None:
+        self._table = table
+        self._inline = inline_params
+        self._params = table._class_params(inline_params)
+        self._sorted: bool | None = None
+        self._first: int | None = None
+        self._blocks: OrderedDict[int, _RowBlock] = OrderedDict()
+        self._last_block: Tuple[int, _RowBlock] | None = None
+
+    @property
+    def table(self) -> FlightTable:
+        return self._table
+
+    def head(self, n: int) -> "FlightView":
+        """View of the first ``n`` flights."""
+        return FlightView(self._table.head(n), self._inline)
+
+    def _index(self, flight_id: str) -> int:
+        # Only the canonical "D{n}" spelling of an id, as yielded by iteration
+        if (not isinstance(flight_id, str) or not flight_id.startswith("D") or not flight_id[1:].isdigit()
+                or f"D{int(flight_id[1:])}" != flight_id):
+            raise KeyError(flight_id)
+        idx = self._table.flight_idx
+        if self._sorted is None:
+            self._sorted = bool(np.all(idx[1:] > idx[:-1]))
+            # Generated tables number their flights consecutively
+            if self._sorted and len(idx) and int(idx[-1]) - int(idx[0]) == len(idx) - 1:
+                self._first = int(idx[0])
+        n = int(flight_id[1:])
+        if self._first is not None:
+            if 0 <= n - self._first < len(idx):
+                return n - self._first
+        elif self._sorted:
+            i = int(np.searchsorted(idx, n))
+            if i < len(idx) and idx[i] == n:
+                return i
+        else:
+            hits = np.flatnonzero(idx == n)
+            if len(hits):
+                return int(hits[0])
+        raise KeyError(flight_id)
+
+    def _block(self, b: int) -> _RowBlock:
+        if self._last_block is not None and self._last_block[0] == b:
+            return self._last_block[1]
+        block = self._blocks.get(b)
+        if block is None:
+            start = b * _DECODE_BLOCK
+            block = _RowBlock.decode(self._table, start, min(start + _DECODE_BLOCK, len(self._table)))
+            self._blocks[b] = block
+            if len(self._blocks) > self._CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(b)
+        self._last_block = (b, block)
+        return block
+
+    def __getitem__(self, flight_id: str) -> Dict[str, object]:
+        b, j = divmod(self._index(flight_id), _DECODE_BLOCK)
+        return self._block(b).record(j, self._params)
+
+    def items(self) -> ItemsView[str, Dict[str, object]]:
+        return _FlightItems(self)
+
+    def values(self) -> ValuesView[Dict[str, object]]:
+        return _FlightValues(self)
+
+    def __contains__(self, flight_id: object) -> bool:
+        try:
+            self._index(flight_id)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return (f"D{i}" for i in self._table.flight_idx.tolist())
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class _FlightItems(ItemsView):
+    # Iterates in row order, decoding a block of rows at a time
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, object]]]:
+        return self._mapping._table._records(self._mapping._params)
+
+
+class _FlightValues(ValuesView):
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        return (record for _, record in self._mapping._table._records(self._mapping._params))
+
+
+def as_flight_table(F: FlightTable | Mapping[str, Dict[str, object]],
+                    timing_params: Dict[str, Dict[str, object]] | None = None) -> FlightTable:
+    """
+    Return ``F`` as a ``FlightTable``, converting dict-layout flights with
+    ``FlightTable.from_dict``. ``timing_params`` (see
+    ``timing_params_section``) supplies the timing of ``params_ref`` flights.
+    """
+    if isinstance(F, FlightTable):
+        return F
+    if isinstance(F, FlightView):
+        return F.table
+    timing = None
+    if timing_params is not None and DEFAULT_PARAMS_ID in timing_params:
+        classes = tuple(TimingParams(**timing_params[f"P{k}"]) for k in range(len(timing_params)))
+        timing = classes[0] if len(classes) == 1 else FleetTiming(classes)
+    return FlightTable.from_dict(F, timing)
+
+
+def generate_flight_table(
+    repetitions: int,
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+    departures: DepartureModel | None = None,
+    first_rep: int = 0,
+) -> FlightTable:
+    """
+    Columnar counterpart of ``generate_flight_intentions``: same flights, in
+    the same ``D{idx}`` order, stored as a ``FlightTable``. ``first_rep``
+    skips the earlier repetitions; ids keep their global numbering.
+    """
+    base = BASE_FLIGHTS if base_flights is None else base_flights
+    if not base:
+        empty = np.zeros(0, dtype=np.int64)
+        return FlightTable(node_labels=[], flight_idx=empty, dep_time=empty,
+                           dep=empty.astype(np.int32), arr=empty.astype(np.int32),
+                           path_offsets=np.zeros(1, dtype=np.int64), path_nodes=empty.astype(np.int32),
+                           t_min=empty.astype(np.float64), t_max=empty.astype(np.float64), timing=timing,
+                           timing_class=None if isinstance(timing, TimingParams) else empty.astype(np.int16))
+    _, lengths = _base_flight_arrays(base)
+    dep_time, t_min, t_max = node_time_windows(repetitions, timing, base, first_rep, departures)
+    n_base, path_len = len(base), t_min.shape[2]
+    n_reps = repetitions - first_rep
+
+    # Base paths as padded node-index rows; flights keep repetition-major order
+    # Labels in first-seen order of FlightTable.from_dict, so both layouts save identically
+    node_labels: List[NodeId] = list(dict.fromkeys(n for _, path in base.values()
+                                                   for n in (path[0], path[-1], *path)))
+    index = {n: i for i, n in enumerate(node_labels)}
+    padded = np.zeros((n_base, path_len), dtype=np.int32)
+    for b, (_, path) in enumerate(base.values()):
+        padded[b, :len(path)] = [index[n] for n in path]
+    valid = np.broadcast_to(np.arange(path_len) < lengths[:, None], t_min.shape)
+
+    timing_class = None
+    if isinstance(timing, FleetTiming):
+        timing_class = np.tile(_timing_classes(timing, n_base)[1].astype(np.int16), n_reps)
+    all_lengths = np.tile(lengths, n_reps)
+    path_offsets = np.zeros(len(all_lengths) + 1, dtype=np.int64)
+    np.cumsum(all_lengths, out=path_offsets[1:])
+    return FlightTable(
+        node_labels=node_labels,
+        flight_idx=np.arange(first_rep * n_base + 1, repetitions * n_base + 1, dtype=np.int64),
+        dep_time=dep_time.reshape(-1),
+        dep=np.tile(padded[:, 0], n_reps),
+        arr=np.tile(padded[np.arange(n_base), lengths - 1], n_reps),
+        path_offsets=path_offsets,
+        path_nodes=np.broadcast_to(padded, t_min.shape)[valid],
+        t_min=t_min[valid],
+        t_max=t_max[valid],
+        timing=timing,
+        timing_class=timing_class,
+    )
+
+
 def generate_flight_intentions(
     repetitions: int,
-    timing: TimingParams,
-    base_flights: Dict[str, Tuple[int, List[str]]] | None = None,
-) -> Dict[str, Dict[str, object]]:
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+    engine: str = "python",
+    layout: str = "dict",
+    inline_params: bool = False,
+    workers: int | None = 1,
+    departures: DepartureModel | None = None,
+) -> Dict[str, Dict[str, object]] | FlightView | FlightTable:
     """
     Enhanced flight intentions:
       - Earliest timestamps: ground delay = 0, climb = earliest_climb_levels.
       - Latest timestamps: ground delay = ground_delay_max, climb = latest_climb_levels.
       - Cruise speeds: use v_max (earliest) and v_min (latest).
+
+    ``engine="numpy"`` builds a ``FlightTable`` (``node_time_windows``
+    computes all timestamps at once) and returns it as a read-only
+    ``FlightView`` mapping, which decodes each record on access: equal to
+    the dict of the default engine, without ever holding all its records.
+    Records are decoded a block of rows at a time, so iterating or saving
+    every record takes about as long, arrays included, as the default
+    engine spends generating them; copying the view into a dict is up to
+    ~20% slower. For speed keep the arrays: ``layout="columnar"`` returns
+    the ``FlightTable`` itself.
+
+    Flights reference the shared timing parameters through
+    ``"params_ref"`` (see ``timing_params_section``); ``inline_params=True``
+    keeps the legacy layout with a full ``"params"`` copy in every flight.
+    A ``FleetTiming`` gives each base flight, and its repetitions, the
+    parameters of its drone class, referenced as ``"P{class}"``.
+
+    ``workers > 1`` (or ``None`` for ``os.cpu_count()``) splits the
+    repetitions into contiguous shards whose ``FlightTable`` is built by a
+    process pool; the parent only concatenates their arrays, so flight ids
+    and output match the sequential run. It applies to
+    ``layout="columnar"`` and ``engine="numpy"``: dict records would have
+    to be unpickled and merged serially in the parent, at about the cost
+    of generating them, so the pure-Python engine raises ``ValueError``
+    for ``workers != 1``. To write records from the workers directly, use
+    ``save_flight_intentions_shards``.
+
+    ``departures`` replaces the fixed 60 s shift between repetitions by
+    another ``DepartureModel``: other offset strategies (``FixedOffsets``
+    with another interval, ``GeometricOffsets``, ``DensityOffsets``) or
+    random models (jitter, Poisson arrivals, rush-hour profiles); seeded
+    models rebuild identical instances.
+    """
+    if layout not in ("dict", "columnar"):
+        raise ValueError(f"unknown layout {layout!r}; expected 'dict' or 'columnar'")
+    if engine not in ("python", "numpy"):
+        raise ValueError(f"unknown engine {engine!r}; expected 'python' or 'numpy'")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if layout == "columnar" or engine == "numpy":
+        if workers > 1 and repetitions > 1:
+            table = _generate_flight_table_parallel(repetitions, timing, base_flights, workers, departures)
+        else:
+            table = generate_flight_table(repetitions, timing, base_flights, departures)
+        return table if layout == "columnar" else FlightView(table, inline_params)
+    if workers != 1:
+        raise ValueError("workers only applies to engine='numpy' or layout='columnar'; "
+                         "use save_flight_intentions_shards to write dict records in parallel")
+    return dict(iter_flight_intentions(repetitions, timing, base_flights, inline_params, departures=departures))
+
+
+def _generate_flight_table_parallel(
+    repetitions: int,
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None,
+    workers: int,
+    departures: DepartureModel | None = None,
+) -> FlightTable:
+    workers = min(workers, repetitions)
+    bounds = [repetitions * w // workers for w in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = [
+            pool.submit(generate_flight_table, stop, timing, base_flights, departures, start)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        # Shards cover consecutive repetitions, so concatenating in order keeps D{idx} order
+        return _concat_flight_tables([shard.result() for shard in shards])
+
+
+def _concat_flight_tables(tables: List[FlightTable]) -> FlightTable:
+    # Tables of the same base flights share node_labels and timing
+    first = tables[0]
+    path_offsets = [first.path_offsets[:1]]
+    end = 0
+    for table in tables:
+        path_offsets.append(table.path_offsets[1:] + end)
+        end += int(table.path_offsets[-1])
+    return FlightTable(
+        node_labels=first.node_labels,
+        flight_idx=np.concatenate([t.flight_idx for t in tables]),
+        dep_time=np.concatenate([t.dep_time for t in tables]),
+        dep=np.concatenate([t.dep for t in tables]),
+        arr=np.concatenate([t.arr for t in tables]),
+        path_offsets=np.concatenate(path_offsets),
+        path_nodes=np.concatenate([t.path_nodes for t in tables]),
+        t_min=np.concatenate([t.t_min for t in tables]),
+        t_max=np.concatenate([t.t_max for t in tables]),
+        timing=first.timing,
+        timing_class=None if first.timing_class is None else np.concatenate([t.timing_class for t in tables]),
+    )
+
+
+def iter_flight_intentions(
+    repetitions: int,
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+    inline_params: bool = False,
+    first_rep: int = 0,
+    departures: DepartureModel | None = None,
+) -> Iterator[Tuple[str, Dict[str, object]]]:
+    """
+    Lazily yield ``(flight_id, record)`` pairs in repetition order.
+
+    Produces the same flights as ``generate_flight_intentions`` without
+    materializing ``F``. With the default ``FixedOffsets`` or any other
+    ``RepetitionOffsets`` model, take-off times are computed a block of
+    repetitions at a time, so memory stays constant in the number of
+    repetitions; pair it with ``save_flight_intentions_jsonl`` to stream an
+    instance to disk. Random models (``Jitter``, ``PoissonArrivals``,
+    ``RushHour``) draw all take-off times (one int per flight) up front to
+    keep their draws reproducible. ``first_rep`` skips the earlier
+    repetitions; ids keep their global numbering.
     """
     base = BASE_FLIGHTS if base_flights is None else base_flights
-    F: Dict[str, Dict[str, object]] = {}
-    idx = 0
+    fleet, class_of = _timing_classes(timing, len(base))
+    params = _inline_params(fleet, inline_params)
+    idx = first_rep * len(base)
 
-    for r in range(repetitions):
-        add = _piecewise_offset(r)
+    # Cumulative cruise profiles only depend on the path length and class
+    profiles = []
+    for (_, (t0, path)), k in zip(base.items(), class_of.tolist()):
+        tp = fleet.classes[k]
+        num_edges = max(0, len(path) - 1)
+        cum_fast = _cumulative_edge_times(num_edges, tp.edge_length, tp.v_max)
+        cum_slow = _cumulative_edge_times(num_edges, tp.edge_length, tp.v_min)
+        profiles.append((path, cum_fast, cum_slow, tp, k))
 
-        for _, (t0, path) in base.items():
+    t0_all, _ = _base_flight_arrays(base)
+    for row in _departure_rows(repetitions, t0_all, departures, first_rep):
+        for dep_time, (path, cum_fast, cum_slow, tp, c) in zip(row.tolist(), profiles):
             idx += 1
             dep_node, arr_node = path[0], path[-1]
-            num_edges = max(0, len(path) - 1)
 
-            cum_fast = _cumulative_edge_times(num_edges, timing.edge_length, timing.v_max)
-            cum_slow = _cumulative_edge_times(num_edges, timing.edge_length, timing.v_min)
-
-            t_sched = float(t0 + add)
-            t0_min = t_sched + timing.earliest_climb_levels * timing.climb_time_per_level
-            t0_max = t_sched + timing.ground_delay_max + timing.latest_climb_levels * timing.climb_time_per_level
+            t_sched = float(dep_time)
+            t0_min = t_sched + tp.earliest_climb_levels * tp.climb_time_per_level
+            t0_max = t_sched + tp.ground_delay_max + tp.latest_climb_levels * tp.climb_time_per_level
 
             node_times = []
             for k, node in enumerate(path):
@@ -125,22 +1424,18 @@ def generate_flight_intentions(
                 t_max = t0_max + cum_slow[k]
                 node_times.append({"node": node, "t_min": t_min, "t_max": t_max})
 
-            F[f"D{idx}"] = {
+            yield f"D{idx}", {
                 "dep": dep_node,
                 "arr": arr_node,
-                "dep_time": int(t0 + add),
+                "dep_time": dep_time,
                 "path": list(path),
-                "params": {
-                    **asdict(timing)
-                },
+                **_params_field(None if params is None else params[c], c),
                 "node_times": node_times,
             }
 
-    return F
-
 
-def generate_separation_nodes(F_templates: Dict[str, Tuple[int, List[str]]],
-                              min_sep: int = 16) -> Dict[str, int]:
+def generate_separation_nodes(F_templates: Dict[str, Tuple[int, List[NodeId]]],
+                              min_sep: int = 16) -> Dict[NodeId, int]:
     """
     Parameters
     ----------
@@ -152,71 +1447,396 @@ def generate_separation_nodes(F_templates: Dict[str, Tuple[int, List[str]]],
     Returns
     -------
     dict
-        Sep_Nodes mapping node_id (str) -> separation_time (int).
-    """
-    
-    Sep_Nodes: Dict[str, int] = {}
-
-    for _, (t0, path) in F_templates.items():
-        # Remove duplicates while preserving order
-        seen = set()
-        dedup_path: List[str] = []
-        for n in path:
-            if n not in seen:
-                seen.add(n)
-                dedup_path.append(n)
+        Sep_Nodes mapping node_id (str, or int for ``int_node_ids`` templates)
+        -> separation_time (int).
 
-        if dedup_path:
-            for node in dedup_path:
-                if node not in Sep_Nodes:
-                    Sep_Nodes[node] = min_sep
-                    
-    return Sep_Nodes
+    See ``instance_conflicts.contested_separation_nodes`` to keep only the
+    nodes where flights can actually interact.
+    """
+    # Union of the template path nodes, in order of first appearance
+    return dict.fromkeys((n for _, path in F_templates.values() for n in path), min_sep)
 
 
 def save_results_as_json(filepath: Path,
-                         F: Dict[str, Dict[str, object]],
-                         Sep_Nodes: Dict[str, int]) -> None:
+                         F: Mapping[str, Dict[str, object]] | Iterable[Tuple[str, Dict[str, object]]],
+                         Sep_Nodes: Dict[NodeId, int],
+                         timing_params: Dict[str, Dict[str, object]] | None = None,
+                         compact: bool = False) -> None:
     """
     Persist outputs to a single JSON file with two top‑level keys: 'F' and 'Sep_Nodes'.
+    When given, ``timing_params`` (see ``timing_params_section``) is written
+    under a third key, 'TimingParams', for flights using ``params_ref``.
+
+    The file is written incrementally, one flight at a time. ``F`` may be a
+    mapping (a dict or a ``FlightView``), whose flights are written in
+    sorted id order, or an iterable of
+    ``(flight_id, record)`` pairs (e.g. ``iter_flight_intentions``), written
+    in the order given. The output is byte-identical to
+    ``json.dump(payload, indent=2, sort_keys=True)`` whenever the flights
+    come in sorted id order. ``compact=True`` drops indentation and spaces.
+    Integer node ids are written as strings.
     """
-    payload = {"F": F, "Sep_Nodes": Sep_Nodes}
+    if compact:
+        encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        nl = nl_1 = nl_2 = ""
+        colon = ":"
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, indent=2)
+        nl, nl_1, nl_2 = "\n", "\n  ", "\n    "
+        colon = ": "
+
+    def nested(value: object, newline: str) -> str:
+        # Literal newlines only occur as indentation (strings escape theirs)
+        return encoder.encode(value).replace("\n", newline) if newline else encoder.encode(value)
+
+    flights = ((fid, F[fid]) for fid in sorted(F)) if isinstance(F, Mapping) else iter(F)
+
     filepath.parent.mkdir(parents=True, exist_ok=True)
     with filepath.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2, sort_keys=True)
+        # Top-level keys in sorted order: F, Sep_Nodes, TimingParams
+        f.write("{" + nl_1 + '"F"' + colon + "{")
+        sep = nl_2
+        for fid, record in flights:
+            f.write(sep + encoder.encode(fid) + colon + nested(_str_node_ids(record), nl_2))
+            sep = "," + nl_2
+        if sep != nl_2:
+            f.write(nl_1)
+        f.write("}," + nl_1 + '"Sep_Nodes"' + colon + nested({str(n): v for n, v in Sep_Nodes.items()}, nl_1))
+        if timing_params is not None:
+            f.write("," + nl_1 + '"TimingParams"' + colon + nested(timing_params, nl_1))
+        f.write(nl + "}")
 
 
-# -----------------------------
-# Example run producing a file
-# -----------------------------
-if __name__ == "__main__":
+def save_flight_intentions_jsonl(filepath: Path,
+                                 flights: Iterable[Tuple[str, Dict[str, object]]],
+                                 timing_params: Dict[str, Dict[str, object]] | None = None,
+                                 Sep_Nodes: Dict[NodeId, int] | None = None) -> int:
+    """
+    Stream flights to a JSON Lines file, one ``{"id": flight_id, ...record}``
+    object per line, in the order they are yielded (e.g. by
+    ``iter_flight_intentions``). Returns the number of flights written.
+    Integer node ids are written as strings.
+
+    When given, ``timing_params`` (see ``timing_params_section``) and
+    ``Sep_Nodes`` are written first, as a header line
+    ``{"Sep_Nodes": {...}, "TimingParams": {...}}`` without an ``id``, so
+    the file is a whole instance and defines the ``params_ref`` of its
+    flights; a flight whose ``params_ref`` it does not define raises
+    ``ValueError``.
+    """
+    header: Dict[str, object] = {}
+    if Sep_Nodes is not None:
+        header["Sep_Nodes"] = {str(n): v for n, v in Sep_Nodes.items()}
+    if timing_params is not None:
+        header["TimingParams"] = timing_params
+    return _write_jsonl(filepath, flights, header or None, set(timing_params or ()))
+
+
+def _write_jsonl(filepath: Path,
+                 flights: Iterable[Tuple[str, Dict[str, object]]],
+                 header: Dict[str, object] | None,
+                 params_ids: set) -> int:
+    # header: sections of the leading line (None: no header line); params_ids: valid params_ref values
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with filepath.open("w", encoding="utf-8") as f:
+        if header is not None:
+            f.write(json.dumps(header, ensure_ascii=False, sort_keys=True) + "\n")
+        for fid, record in flights:
+            ref = record.get("params_ref")
+            if ref is not None and ref not in params_ids:
+                raise ValueError(f"flight {fid} references params {ref!r}, which timing_params does not define")
+            f.write(json.dumps({"id": fid, **_str_node_ids(record)}, ensure_ascii=False, sort_keys=True))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def load_flight_intentions_jsonl(filepath: Path) -> Tuple[Dict[str, Dict[str, object]], Dict[str, object]]:
+    """
+    Read a file written by ``save_flight_intentions_jsonl`` (or the
+    concatenated shards of ``save_flight_intentions_shards``). Returns
+    ``(F, sections)``, ``sections`` holding the header sections by name,
+    e.g. ``sections["TimingParams"]`` and ``sections["Sep_Nodes"]``.
+    """
+    F: Dict[str, Dict[str, object]] = {}
+    sections: Dict[str, object] = {}
+    with filepath.open("r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if "id" in record:
+                F[record.pop("id")] = record
+            else:
+                sections.update(record)
+    return F, sections
+
+
+def _write_jsonl_shard(filepath: Path,
+                       repetitions: int,
+                       timing: TimingParams | FleetTiming,
+                       base_flights: Dict[str, Tuple[int, List[NodeId]]] | None,
+                       inline_params: bool,
+                       first_rep: int,
+                       departures: DepartureModel | None = None) -> int:
+    flights = iter_flight_intentions(repetitions, timing, base_flights, inline_params, first_rep, departures)
+    timing_params = timing_params_section(timing)
+    # Only the first shard carries the header, so the shards concatenate to one file
+    header = {"TimingParams": timing_params} if first_rep == 0 else None
+    return _write_jsonl(filepath, flights, header, set(timing_params))
+
+
+def save_flight_intentions_shards(dirpath: Path,
+                                  repetitions: int,
+                                  timing: TimingParams | FleetTiming,
+                                  base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+                                  inline_params: bool = False,
+                                  workers: int | None = None,
+                                  departures: DepartureModel | None = None) -> List[Path]:
+    """
+    Generate flights in a process pool, each worker streaming its contiguous
+    range of repetitions to its own JSON Lines file, so no flight is sent
+    back to the parent process. Returns the shard paths in order; the first
+    starts with the ``TimingParams`` header line, and their concatenation
+    equals ``save_flight_intentions_jsonl`` of the sequential
+    ``iter_flight_intentions`` with ``timing_params_section(timing)``.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, repetitions))
+    bounds = [repetitions * w // workers for w in range(workers + 1)]
+    paths = [dirpath / f"flights-{w:05d}.jsonl" for w in range(workers)]
+    dirpath.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [
+            pool.submit(_write_jsonl_shard, path, stop, timing, base_flights, inline_params, start, departures)
+            for path, start, stop in zip(paths, bounds[:-1], bounds[1:])
+        ]
+        for job in jobs:
+            job.result()
+    return paths
+
+
+# File suffix of each instance format
+INSTANCE_FORMATS = {"json": ".json", "jsonl": ".jsonl", "binary": ".bin"}
+
+
+def save_instance(filepath: Path,
+                  fmt: str,
+                  F: Mapping[str, Dict[str, object]],
+                  Sep_Nodes: Dict[NodeId, int],
+                  timing: TimingParams | FleetTiming,
+                  grid: GridCSR | None = None) -> None:
+    """
+    Write an instance as ``fmt``: "json" (``save_results_as_json``), "jsonl"
+    (``save_flight_intentions_jsonl``, after a Sep_Nodes and TimingParams
+    header line) or "binary"
+    (``instance_binary.save_instance_binary``, including ``grid``).
+    """
+    if fmt == "json":
+        save_results_as_json(filepath, F=F, Sep_Nodes=Sep_Nodes, timing_params=timing_params_section(timing))
+    elif fmt == "jsonl":
+        save_flight_intentions_jsonl(filepath, F.items(), timing_params_section(timing), Sep_Nodes)
+    elif fmt == "binary":
+        from instance_binary import save_instance_binary
+        save_instance_binary(filepath, F, Sep_Nodes, timing_params_section(timing), grid=grid)
+    else:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {sorted(INSTANCE_FORMATS)}")
+
+
+def generate_instance_family(
+    repetitions: Iterable[int],
+    timing: TimingParams | FleetTiming,
+    base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+    min_sep: int = 16,
+    engine: str = "python",
+    inline_params: bool = False,
+    workers: int | None = 1,
+    departures: DepartureModel | None = None,
+) -> Iterator[Tuple[int, Dict[str, Dict[str, object]], Dict[NodeId, int]]]:
+    """
+    Yield ``(repetitions, F, Sep_Nodes)`` for each requested repetition
+    count, in the order given.
+
+    Repetition ``r`` never depends on the total count, so the instance with
+    ``n`` repetitions is the first ``n * len(base_flights)`` flights of the
+    largest one: flights are generated once, for the largest count, and
+    shared between the yielded instances. ``Sep_Nodes`` only depends on the
+    templates and is computed once as well. ``DepartureModel`` draws keep
+    this prefix property.
+    """
+    counts = list(repetitions)
+    base = BASE_FLIGHTS if base_flights is None else base_flights
+    if not counts:
+        return
+    F_all = generate_flight_intentions(max(counts), timing, base, engine=engine,
+                                       inline_params=inline_params, workers=workers, departures=departures)
+    Sep_Nodes = generate_separation_nodes(base, min_sep=min_sep)
+    for n in counts:
+        if isinstance(F_all, FlightView):
+            yield n, F_all.head(n * len(base)), Sep_Nodes
+        else:
+            yield n, dict(itertools.islice(F_all.items(), n * len(base))), Sep_Nodes
+
+
+def _repetition_list(values: List[str]) -> List[int]:
+    # "5" or inclusive ranges "START:STOP[:STEP]"
+    counts: List[int] = []
+    for value in values:
+        if ":" in value:
+            start, stop, *step = (int(v) for v in value.split(":"))
+            counts.extend(range(start, stop + 1, step[0] if step else 1))
+        else:
+            counts.append(int(value))
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError("repetitions must be positive integers")
+    return counts
+
+
+def _timing_overrides(value: str) -> Dict[str, object]:
+    # "v_min=2,v_max=6": TimingParams fields of an extra drone class
+    overrides: Dict[str, object] = {}
+    for item in value.split(","):
+        name, _, raw = item.partition("=")
+        if name.strip() not in TIMING_FIELD_TYPES or not raw:
+            raise argparse.ArgumentTypeError(f"expected FIELD=VALUE pairs of TimingParams fields, got {item!r}")
+        overrides[name.strip()] = TIMING_FIELD_TYPES[name.strip()](raw)
+    return overrides
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    Generate one instance per repetition count from the command line, e.g.
+    ``python Instance_academic.py --repetitions 1:10 --output "out/flights_{repetitions}.json"``.
+    Without arguments this writes the example instance ``flight_data.json``.
+    """
+    parser = argparse.ArgumentParser(description="Generate academic drone trajectory instances.")
+    grid = parser.add_argument_group("grid (GridSpec)")
+    grid.add_argument("--rows", type=int, default=9)
+    grid.add_argument("--cols", type=int, default=8)
+    grid.add_argument("--edge-length", type=float, default=60.0)
+    grid.add_argument("--undirected", action="store_true")
+    params = parser.add_argument_group("timing (TimingParams)")
+    params.add_argument("--v-min", type=float, default=4)
+    params.add_argument("--v-max", type=float, default=10)
+    params.add_argument("--ground-delay-max", type=float, default=120.0)
+    params.add_argument("--n-flight-levels", type=int, default=2)
+    params.add_argument("--climb-time-per-level", type=float, default=30.0)
+    params.add_argument("--earliest-climb-levels", type=int, default=1)
+    params.add_argument("--latest-climb-levels", type=int, default=2)
+    params.add_argument("--drone-class", type=_timing_overrides, action="append", default=[],
+                        metavar="FIELD=VALUE,...",
+                        help="extra drone class overriding these parameters, e.g. v_min=2,v_max=6 (repeatable); "
+                             "base flights are assigned to classes at random with --class-seed")
+    params.add_argument("--class-seed", type=int, default=0)
+    parser.add_argument("--repetitions", nargs="+", default=["1"],
+                        help="repetition counts, or inclusive ranges START:STOP[:STEP]")
+    parser.add_argument("--min-sep", type=int, default=28)
+    paths = parser.add_argument_group("random base flights (instead of BASE_FLIGHTS)")
+    paths.add_argument("--random-flights", type=int, default=0, help="number of random templates")
+    paths.add_argument("--seed", type=int, default=0)
+    paths.add_argument("--path-method", choices=("shortest", "walk"), default="shortest")
+    paths.add_argument("--winding", type=float, default=0.5)
+    departures = parser.add_argument_group("departure times (DepartureModel)")
+    departures.add_argument("--departures", choices=sorted(DEPARTURE_MODELS), default="fixed")
+    departures.add_argument("--interval", type=float, default=60.0,
+                            help="seconds between repetitions (fixed), or first gap (geometric)")
+    departures.add_argument("--ratio", type=float, default=1.1, help="growth of the gaps (geometric)")
+    departures.add_argument("--flights-per-minute", type=float, default=5.0, help="target density (density)")
+    departures.add_argument("--departure-seed", type=int, default=0)
+    departures.add_argument("--jitter", type=float, default=30.0, help="jitter scale in seconds")
+    departures.add_argument("--mean-interval", type=float, default=60.0,
+                            help="mean seconds between repetitions of a flight (poisson, rush-hour)")
+    departures.add_argument("--rush-profile", type=float, nargs="+", default=[1.0, 3.0, 1.0],
+                            help="relative intensity of each period (rush-hour)")
+    departures.add_argument("--rush-period", type=float, default=3600.0, help="period length in seconds")
+    parser.add_argument("--engine", choices=("python", "numpy"), default="python",
+                        help="numpy: build arrays and decode each flight only when it is saved")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes per generation (0: all cores); numpy engine only")
+    parser.add_argument("--inline-params", action="store_true")
+    parser.add_argument("--format", choices=sorted(INSTANCE_FORMATS), default="json")
+    parser.add_argument("--output", default=None,
+                        help="output path, with {repetitions} replaced by the repetition count")
+    parser.add_argument("--profile", action="store_true", help="report per-stage timings (or INSTANCE_PROFILE=1)")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = _repetition_list(args.repetitions)
+    except (ValueError, argparse.ArgumentTypeError) as exc:
+        parser.error(f"--repetitions: {exc}")
+    if args.workers != 1 and args.engine != "numpy":
+        parser.error("--workers requires --engine numpy")
+    suffix = INSTANCE_FORMATS[args.format]
+    output = args.output
+    if output is None:
+        output = "flight_data" + ("" if len(counts) == 1 else "_{repetitions}") + suffix
+    if len(counts) > 1 and "{repetitions}" not in output:
+        parser.error("--output must contain {repetitions} when generating several instances")
 
     timing = TimingParams(
-        edge_length=60.0,
-        v_min=4,
-        v_max=10,
-        ground_delay_max=120.0,
-        n_flight_levels=2,
-        climb_time_per_level=30.0,
-        earliest_climb_levels=1,  # as requested
-        latest_climb_levels=2     # as requested
+        edge_length=args.edge_length,
+        v_min=args.v_min,
+        v_max=args.v_max,
+        ground_delay_max=args.ground_delay_max,
+        n_flight_levels=args.n_flight_levels,
+        climb_time_per_level=args.climb_time_per_level,
+        earliest_climb_levels=args.earliest_climb_levels,
+        latest_climb_levels=args.latest_climb_levels,
     )
-    
-    # 1) Build a 9x8 directed grid with unit lengths and its line‑graph dual
-    spec = GridSpec(rows=9, cols=8, edge_length=60.0, directed=True)
-    coord_to_id, G = create_graph(spec)
+    departure_model: DepartureModel | None = None
+    if args.departures == "fixed" and args.interval != 60.0:
+        departure_model = FixedOffsets(interval=args.interval)
+    elif args.departures == "geometric":
+        departure_model = GeometricOffsets(interval=args.interval, ratio=args.ratio)
+    elif args.departures == "density":
+        departure_model = DensityOffsets(flights_per_minute=args.flights_per_minute)
+    elif args.departures == "jitter":
+        departure_model = Jitter(scale=args.jitter, seed=args.departure_seed, base=FixedOffsets(args.interval))
+    elif args.departures == "poisson":
+        departure_model = PoissonArrivals(seed=args.departure_seed, mean_interval=args.mean_interval)
+    elif args.departures == "rush-hour":
+        departure_model = RushHour(seed=args.departure_seed, profile=tuple(args.rush_profile),
+                                   period=args.rush_period, mean_interval=args.mean_interval)
+    profiler = Profiler(enabled=True if args.profile else None)
 
-    # 2) Generate one replication of base flight intentions
-    F = generate_flight_intentions(repetitions=1, 
-                                   timing=timing,
-                                   base_flights=BASE_FLIGHTS)
+    # The grid is built once for the whole family
+    spec = GridSpec(rows=args.rows, cols=args.cols, edge_length=args.edge_length, directed=not args.undirected)
+    with profiler.stage("create_graph") as stage:
+        csr = build_grid_csr(spec)
+        stage.count(nodes=csr.num_nodes, arcs=csr.num_arcs)
 
-    # 3) Generate per‑node separation requirements from base templates
-    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    base = BASE_FLIGHTS
+    if args.random_flights:
+        with profiler.stage("random_flight_templates") as stage:
+            base = random_flight_templates(spec, args.random_flights, seed=args.seed,
+                                           method=args.path_method, winding=args.winding)
+            stage.count(flights=len(base))
 
-    # 4) Save to JSON
-    out_path = Path("flight_data.json")
-    save_results_as_json(out_path, F=F, Sep_Nodes=Sep_Nodes)
+    if args.drone_class:
+        classes = [timing] + [replace(timing, **overrides) for overrides in args.drone_class]
+        timing = FleetTiming.mixed(classes, len(base), seed=args.class_seed)
 
-    print(f"JSON written to: {out_path.resolve()}")
-    
+    with profiler.stage("generate_flight_intentions") as stage:
+        family = list(generate_instance_family(counts, timing, base, min_sep=args.min_sep,
+                                               engine=args.engine, inline_params=args.inline_params,
+                                               workers=args.workers or None, departures=departure_model))
+        stage.count(flights=len(base) * max(counts))
+
+    for n, F, Sep_Nodes in family:
+        out_path = Path(output.replace("{repetitions}", str(n)))
+        with profiler.stage(f"save {out_path.name}") as stage:
+            save_instance(out_path, args.format, F, Sep_Nodes, timing, grid=csr)
+            stage.count(flights=len(F), bytes=out_path.stat().st_size)
+        print(f"{args.format.upper()} written to: {out_path.resolve()}")
+
+    profiler.report()
+    return 0
+
+
+# -----------------------------
+# Example run producing a file
+# -----------------------------
+if __name__ == "__main__":
+    # Run through the importable module so its classes are shared with instance_binary
+    from Instance_academic import main as _main
+    sys.exit(_main())
@@ -0,0 +1,210 @@
+"""
+Benchmarks for the instance generator pipeline.
+
+Each (grid, repetitions) case runs in a fresh process, stage by stage:
+create_graph -> generate_flight_intentions -> generate_separation_nodes ->
+save_results_as_json. The flights of a case are ``--templates`` random
+shortest-path templates on its grid (``random_flight_templates``, fixed
+seed), so path lengths, and every stage, scale with the grid. Per stage we record the best wall time over
+``--repeat`` runs, the process peak RSS after the stage and the size of
+its output, and write everything to a JSON report. With ``--engine numpy``
+flight records are only decoded when saved, so that cost moves from the
+generation stage to the save stage; compare the pipelines end to end:
+
+    python bench_instance.py --grids 9x8 100x100 --repetitions 1 100 1000 -o report.json
+    python bench_instance.py --compare base.json report.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+from Instance_academic import (FlightView, GridSpec, TimingParams, create_graph, generate_flight_intentions,
+                               generate_separation_nodes, random_flight_templates, save_results_as_json,
+                               timing_params_section)
+
+REPORT_VERSION = 2
+
+# Seed of the flight templates of every case
+TEMPLATE_SEED = 0
+
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4,
+    v_max=10,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+
+
+def _peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> Tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def run_case(rows: int, cols: int, repetitions: int, engine: str, repeat: int,
+             templates: int = 5) -> List[Dict[str, object]]:
+    """Run the pipeline once for a grid size and repetition count; one record per stage."""
+    records: List[Dict[str, object]] = []
+
+    def record(stage: str, seconds: float, output_items: int, output_bytes: int | None = None) -> None:
+        records.append({
+            "grid": f"{rows}x{cols}",
+            "repetitions": repetitions,
+            "engine": engine,
+            "templates": templates,
+            "stage": stage,
+            "seconds": seconds,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "output_items": output_items,
+            "output_bytes": output_bytes,
+        })
+
+    spec = GridSpec(rows=rows, cols=cols, edge_length=TIMING.edge_length, directed=True)
+    seconds, (_, G) = _best_of(repeat, lambda: create_graph(spec))
+    record("create_graph", seconds, G.number_of_edges())
+
+    base = random_flight_templates(spec, templates, seed=TEMPLATE_SEED, min_length=min(2, rows + cols - 2))
+    seconds, F = _best_of(repeat, lambda: generate_flight_intentions(repetitions, TIMING, base, engine=engine))
+    n_nodes = len(F.table.path_nodes) if isinstance(F, FlightView) else sum(len(r["node_times"]) for r in F.values())
+    record("generate_flight_intentions", seconds, n_nodes)
+
+    seconds, Sep_Nodes = _best_of(repeat, lambda: generate_separation_nodes(base, min_sep=28))
+    record("generate_separation_nodes", seconds, len(Sep_Nodes))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = Path(tmp) / "instance.json"
+        seconds, _ = _best_of(repeat, lambda: save_results_as_json(
+            out_path, F=F, Sep_Nodes=Sep_Nodes, timing_params=timing_params_section(TIMING)))
+        record("save_results_as_json", seconds, len(F), out_path.stat().st_size)
+    return records
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(grids: List[Tuple[int, int]], repetitions: List[int],
+                   engine: str = "python", repeat: int = 3, templates: int = 5) -> Dict[str, object]:
+    """Run every (grid, repetitions) case in its own process and return the report."""
+    results: List[Dict[str, object]] = []
+    for rows, cols in grids:
+        for reps in repetitions:
+            # A fresh process per case keeps peak RSS from leaking across cases
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                results.extend(pool.submit(run_case, rows, cols, reps, engine, repeat, templates).result())
+    return {
+        "version": REPORT_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "templates": templates,
+            "template_seed": TEMPLATE_SEED,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(base: Dict[str, object], new: Dict[str, object],
+                    threshold: float = 1.10, min_seconds: float = 1e-3) -> List[Dict[str, object]]:
+    """
+    Match the records of two reports by (grid, repetitions, engine, templates, stage)
+    and return their time and peak RSS ratios (new / base), with
+    ``regression`` set when either exceeds ``threshold``. Stages faster
+    than ``min_seconds`` in both reports are too noisy to flag on time.
+    """
+    def key(r: Dict[str, object]) -> Tuple[object, ...]:
+        # Reports before version 2 ran BASE_FLIGHTS (no "templates"), so they never match
+        return r["grid"], r["repetitions"], r["engine"], r.get("templates"), r["stage"]
+
+    base_by_key = {key(r): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        b = base_by_key.get(key(r))
+        if b is None:
+            continue
+        time_ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        rss_ratio = r["peak_rss_bytes"] / b["peak_rss_bytes"]
+        timed = max(r["seconds"], b["seconds"]) >= min_seconds
+        rows.append({
+            "grid": r["grid"], "repetitions": r["repetitions"], "engine": r["engine"], "stage": r["stage"],
+            "time_ratio": time_ratio,
+            "rss_ratio": rss_ratio,
+            "regression": (timed and time_ratio > threshold) or rss_ratio > threshold,
+        })
+    return rows
+
+
+def _grid(value: str) -> Tuple[int, int]:
+    rows, _, cols = value.partition("x")
+    return int(rows), int(cols)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grids", nargs="+", type=_grid, default=[(9, 8), (100, 100)],
+                        help="grid sizes as ROWSxCOLS")
+    parser.add_argument("--repetitions", nargs="+", type=int, default=[1, 100, 1000])
+    parser.add_argument("--engine", choices=("python", "numpy"), default="python")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best time is kept")
+    parser.add_argument("--templates", type=int, default=5, help="random flight templates per grid")
+    parser.add_argument("-o", "--output", type=Path, help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"),
+                        help="compare two reports instead of running")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="ratio above which --compare reports a regression")
+    parser.add_argument("--min-seconds", type=float, default=1e-3,
+                        help="ignore time ratios of stages faster than this")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        base, new = (json.loads(p.read_text(encoding="utf-8")) for p in args.compare)
+        rows = compare_reports(base, new, args.threshold, args.min_seconds)
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else ""
+            print(f"{r['grid']:>10} {r['repetitions']:>8} {r['engine']:>6} {r['stage']:<28}"
+                  f" time x{r['time_ratio']:.2f}  rss x{r['rss_ratio']:.2f}  {flag}")
+        return 1 if any(r["regression"] for r in rows) else 0
+
+    report = json.dumps(run_benchmarks(args.grids, args.repetitions, args.engine, args.repeat, args.templates),
+                        indent=2)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
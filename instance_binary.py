@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import mmap
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+from Instance_academic import (FleetTiming, FlightTable, FlightView, GridCSR, NodeId, TimingParams, as_flight_table,
+                               timing_params_section)
+from instance_conflicts import NodeIntervalIndex
+
+
+# File layout:
+#   MAGIC | uint64 header length | JSON header | padding | array 0 | padding | array 1 ...
+# Every array starts on an ALIGN-byte boundary so it can be memory-mapped in place.
+MAGIC = b"IGINST\x00\x01"
+ALIGN = 64
+FORMAT_VERSION = 1
+
+_FLIGHT_ARRAYS = ("flight_idx", "dep_time", "dep", "arr", "path_offsets", "path_nodes", "t_min", "t_max")
+
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_arrays(filepath: Path, arrays: Dict[str, np.ndarray], meta: Dict[str, object]) -> None:
+    """
+    Write named arrays and a JSON-serializable ``meta`` dict to a single
+    binary container file (see ``read_arrays``).
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    specs: Dict[str, Dict[str, object]] = {}
+    offset = 0
+    for name, a in arrays.items():
+        specs[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset = _aligned(offset + a.nbytes)
+
+    header = json.dumps({"version": FORMAT_VERSION, "arrays": specs, "meta": meta},
+                        ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with filepath.open("wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for name, a in arrays.items():
+            f.write(b"\0" * (data_start + specs[name]["offset"] - f.tell()))
+            f.write(a.tobytes())
+
+
+def read_arrays(filepath: Path, mmap_mode: bool = True) -> Tuple[Dict[str, np.ndarray], Dict[str, object]]:
+    """
+    Read a container written by ``write_arrays``.
+
+    Parameters
+    ----------
+    filepath : Path
+        Container file.
+    mmap_mode : bool
+        Memory-map the file (read-only arrays backed by the page cache)
+        instead of reading it into memory.
+
+    Returns
+    -------
+    tuple
+        (arrays, meta)
+    """
+    with filepath.open("rb") as f:
+        if mmap_mode:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = f.read()
+
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filepath} is not an instance binary file")
+    header_len = int(np.frombuffer(buf, dtype=np.uint64, count=1, offset=len(MAGIC))[0])
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(buf[header_start:header_start + header_len]).decode("utf-8"))
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"unsupported instance binary version {header['version']}")
+    data_start = _aligned(header_start + header_len)
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(buf, dtype=dtype, count=count,
+                                     offset=data_start + spec["offset"]).reshape(shape)
+    return arrays, header["meta"]
+
+
+def _int_labels(labels: List[NodeId]) -> np.ndarray | None:
+    # Integer ids and decimal labels (the create_graph convention) can be stored as an int array
+    if all(type(n) is int for n in labels):
+        return np.array(labels, dtype=np.int64)
+    try:
+        as_int = [int(n) for n in labels]
+    except ValueError:
+        return None
+    if any(str(i) != n for i, n in zip(as_int, labels)):
+        return None
+    return np.array(as_int, dtype=np.int64)
+
+
+@dataclass
+class BinaryInstance:
+    """An instance loaded from a binary container file."""
+    flights: FlightTable
+    sep_nodes: np.ndarray              # (m,) int32, node indices into flights.node_labels
+    sep_values: np.ndarray             # (m,) int64, separation times
+    timing_params: Dict[str, Dict[str, object]]
+    grid: Dict[str, np.ndarray] | None
+    grid_meta: Dict[str, object] | None
+    node_intervals: NodeIntervalIndex | None = None
+
+    @property
+    def node_labels(self) -> List[NodeId]:
+        return self.flights.node_labels
+
+    def flight_view(self, inline_params: bool = False) -> FlightView:
+        """Lazy ``F`` mapping; see ``FlightView``."""
+        return FlightView(self.flights, inline_params)
+
+    def sep_nodes_dict(self) -> Dict[NodeId, int]:
+        """Sep_Nodes as written by ``generate_separation_nodes``."""
+        labels = self.node_labels
+        return {labels[n]: v for n, v in zip(self.sep_nodes.tolist(), self.sep_values.tolist())}
+
+    def graph(self) -> Tuple[Dict[Tuple[int, int], NodeId], nx.DiGraph]:
+        """Rebuild the ``(coord_to_id, G)`` pair of ``create_graph``."""
+        if self.grid is None:
+            raise ValueError("instance was saved without a grid")
+        labels = self.node_labels
+        G = nx.DiGraph() if self.grid_meta["directed"] else nx.Graph()
+        G.graph.update(self.grid_meta["graph"])
+        coord_to_id: Dict[Tuple[int, int], NodeId] = {}
+        for n, x, y in zip(self.grid["nodes"].tolist(), self.grid["x"].tolist(), self.grid["y"].tolist()):
+            coord_to_id[(x, y)] = labels[n]
+            G.add_node(labels[n], x=x, y=y)
+        for u, v, length in zip(self.grid["src"].tolist(), self.grid["dst"].tolist(),
+                                self.grid["length"].tolist()):
+            G.add_edge(labels[u], labels[v], length=length)
+        return coord_to_id, G
+
+
+def save_instance_binary(filepath: Path,
+                         F: FlightTable | Dict[str, Dict[str, object]],
+                         Sep_Nodes: Dict[NodeId, int],
+                         timing_params: Dict[str, Dict[str, object]] | None = None,
+                         grid: GridCSR | Tuple[Dict[Tuple[int, int], NodeId], nx.DiGraph] | None = None,
+                         node_intervals: NodeIntervalIndex | None = None) -> None:
+    """
+    Persist an instance to a binary container of flat, memory-mappable arrays.
+
+    Parameters
+    ----------
+    filepath : Path
+        Output file.
+    F : FlightTable or dict
+        Flight intentions, columnar or in the dict layout of
+        ``generate_flight_intentions``.
+    Sep_Nodes : dict
+        Separation times per node.
+    timing_params : dict, optional
+        Top-level "TimingParams" section (see ``timing_params_section``);
+        required to convert dict-layout flights that use ``params_ref``.
+    grid : GridCSR or tuple, optional
+        ``build_grid_csr`` output, or ``(coord_to_id, G)`` as returned by
+        ``create_graph``.
+    node_intervals : NodeIntervalIndex, optional
+        Index built from ``F``, stored so loaders need not rebuild it.
+    """
+    F = as_flight_table(F, timing_params)
+    if timing_params is None:
+        timing_params = timing_params_section(F.timing)
+
+    # One label table shared by flights, Sep_Nodes and the grid
+    node_labels = list(F.node_labels)
+    index = {n: i for i, n in enumerate(node_labels)}
+
+    def node_index(node: NodeId) -> int:
+        if node not in index:
+            index[node] = len(node_labels)
+            node_labels.append(node)
+        return index[node]
+
+    # Integer-id instances (see int_node_ids) keep integer labels
+    int_ids = bool(node_labels) and all(type(n) is int for n in node_labels)
+
+    arrays: Dict[str, np.ndarray] = {name: getattr(F, name) for name in _FLIGHT_ARRAYS}
+    if F.timing_class is not None:
+        arrays["timing_class"] = F.timing_class
+    arrays["sep_nodes"] = np.array([node_index(n) for n in Sep_Nodes], dtype=np.int32)
+    arrays["sep_values"] = np.array(list(Sep_Nodes.values()), dtype=np.int64)
+
+    if isinstance(F.timing, FleetTiming):
+        meta: Dict[str, object] = {"timing_classes": [asdict(c) for c in F.timing.classes]}
+    else:
+        meta = {"timing": asdict(F.timing)}
+    meta.update(timing_params=timing_params, grid=None)
+    if isinstance(grid, GridCSR):
+        # Undirected specs store each lattice edge once, as networkx would
+        src, dst, length = grid.sources(), grid.targets, grid.length
+        if not grid.spec.directed:
+            keep = src < dst
+            src, dst, length = src[keep], dst[keep], length[keep]
+        labels = np.array([node_index(u if int_ids else str(u)) for u in range(grid.num_nodes)], dtype=np.int32)
+        arrays["grid_nodes"] = labels
+        arrays["grid_x"] = grid.x.astype(np.int64)
+        arrays["grid_y"] = grid.y.astype(np.int64)
+        arrays["grid_src"] = labels[src]
+        arrays["grid_dst"] = labels[dst]
+        arrays["grid_length"] = length
+        meta["grid"] = {"directed": grid.spec.directed, "graph": {"geo": False}}
+    elif grid is not None:
+        _, G = grid
+        nodes = list(G.nodes(data=True))
+        edges = list(G.edges(data="length"))
+        arrays["grid_nodes"] = np.array([node_index(n) for n, _ in nodes], dtype=np.int32)
+        arrays["grid_x"] = np.array([d["x"] for _, d in nodes], dtype=np.int64)
+        arrays["grid_y"] = np.array([d["y"] for _, d in nodes], dtype=np.int64)
+        arrays["grid_src"] = np.array([index[u] for u, _, _ in edges], dtype=np.int32)
+        arrays["grid_dst"] = np.array([index[v] for _, v, _ in edges], dtype=np.int32)
+        arrays["grid_length"] = np.array([length for _, _, length in edges], dtype=np.float64)
+        meta["grid"] = {"directed": G.is_directed(), "graph": dict(G.graph)}
+
+    int_labels = _int_labels(node_labels)
+    if int_labels is not None:
+        arrays["node_labels"] = int_labels
+        meta["int_ids"] = all(type(n) is int for n in node_labels)
+    else:
+        meta["node_labels"] = node_labels
+
+    if node_intervals is not None:
+        if len(node_intervals.flight) != len(F.path_nodes) or len(node_intervals.max_width) > len(F.node_labels):
+            raise ValueError("node_intervals was not built from F")
+        arrays.update({f"nidx_{name}": a for name, a in node_intervals.arrays().items()})
+
+    write_arrays(filepath, arrays, meta)
+
+
+def load_instance_binary(filepath: Path, mmap_mode: bool = True) -> BinaryInstance:
+    """
+    Load an instance written by ``save_instance_binary``. With ``mmap_mode``
+    the flight, separation, grid and node interval arrays are read-only
+    views of the memory-mapped file, so loading does not parse or copy them.
+    """
+    arrays, meta = read_arrays(filepath, mmap_mode)
+    if "node_labels" in arrays:
+        node_labels = arrays["node_labels"].tolist()
+        if not meta.get("int_ids", False):
+            node_labels = [str(n) for n in node_labels]
+    else:
+        node_labels = meta["node_labels"]
+
+    if "timing_classes" in meta:
+        timing = FleetTiming(tuple(TimingParams(**c) for c in meta["timing_classes"]))
+    else:
+        timing = TimingParams(**meta["timing"])
+    flights = FlightTable(node_labels=node_labels,
+                          timing=timing,
+                          timing_class=arrays.get("timing_class"),
+                          **{name: arrays[name] for name in _FLIGHT_ARRAYS})
+    grid = None
+    if meta["grid"] is not None:
+        grid = {name[len("grid_"):]: a for name, a in arrays.items() if name.startswith("grid_")}
+    node_intervals = None
+    if "nidx_offsets" in arrays:
+        node_intervals = NodeIntervalIndex.from_arrays(
+            flights, {name[len("nidx_"):]: a for name, a in arrays.items() if name.startswith("nidx_")})
+    return BinaryInstance(flights=flights,
+                          sep_nodes=arrays["sep_nodes"],
+                          sep_values=arrays["sep_values"],
+                          timing_params=meta["timing_params"],
+                          grid=grid,
+                          grid_meta=meta["grid"],
+                          node_intervals=node_intervals)
+
+
+def open_flight_intentions(filepath: Path, inline_params: bool = False) -> FlightView:
+    """
+    Memory-map the flights of a file written by ``save_instance_binary`` and
+    return them as a lazy, read-only ``F`` mapping.
+    """
+    return load_instance_binary(filepath, mmap_mode=True).flight_view(inline_params)
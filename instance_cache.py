@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from Instance_academic import (BASE_FLIGHTS, INSTANCE_FORMATS, GridSpec, NodeId, TimingParams, build_grid_csr,
+                               generate_flight_intentions, generate_separation_nodes, save_instance)
+
+# Bump when a change to the generator alters its output, to invalidate old entries
+CACHE_VERSION = 2
+
+
+def instance_key(spec: GridSpec,
+                 timing: TimingParams,
+                 repetitions: int,
+                 min_sep: int,
+                 base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+                 fmt: str = "json") -> str:
+    """SHA-256 of the canonical JSON of everything that determines an instance file."""
+    base = BASE_FLIGHTS if base_flights is None else base_flights
+    payload = {
+        "version": CACHE_VERSION,
+        "grid": asdict(spec),
+        # 4 and 4.0, or "4" and 4, are kept apart: they are written differently
+        "timing": asdict(timing),
+        "base_flights": {fid: [t0, list(path)] for fid, (t0, path) in base.items()},
+        "repetitions": repetitions,
+        "min_sep": min_sep,
+        "format": fmt,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class InstanceCache:
+    """
+    On-disk cache of instance files keyed by ``instance_key``.
+
+    ``get`` returns the cached file of identical inputs or generates it.
+    Each hit refreshes the entry's modification time; once the cache
+    holds more than ``max_bytes``, the least recently used entries are
+    deleted. Entries are written through a temporary file and renamed, so
+    concurrent processes never see a partial file.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 1 << 30) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str, fmt: str = "json") -> Path:
+        return self.directory / key[:2] / (key + INSTANCE_FORMATS[fmt])
+
+    def get(self,
+            spec: GridSpec,
+            timing: TimingParams,
+            repetitions: int,
+            min_sep: int = 16,
+            base_flights: Dict[str, Tuple[int, List[NodeId]]] | None = None,
+            fmt: str = "json") -> Path:
+        """Path of the cached instance, generating and storing it on a miss."""
+        if fmt not in INSTANCE_FORMATS:
+            raise ValueError(f"unknown format {fmt!r}; expected one of {sorted(INSTANCE_FORMATS)}")
+        path = self.path(instance_key(spec, timing, repetitions, min_sep, base_flights, fmt), fmt)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        tmp = Path(tmp_name)
+        try:
+            _write_instance(tmp, fmt, spec, timing, repetitions, min_sep, base_flights)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.evict(keep=path)
+        return path
+
+    def entries(self) -> List[Path]:
+        return [p for p in self.directory.glob("*/*") if p.suffix in INSTANCE_FORMATS.values()]
+
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.entries())
+
+    def evict(self, keep: Path | None = None) -> List[Path]:
+        """
+        Delete least recently used entries until the cache fits ``max_bytes``,
+        never deleting ``keep``.
+        """
+        stats = []
+        for p in self.entries():
+            if p == keep:
+                continue
+            try:
+                stats.append((p.stat().st_mtime, p.stat().st_size, p))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in stats)
+        if keep is not None and keep.exists():
+            total += keep.stat().st_size
+        removed = []
+        for _, size, p in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed.append(p)
+        return removed
+
+    def clear(self) -> None:
+        for p in self.entries():
+            p.unlink(missing_ok=True)
+
+
+def _write_instance(filepath: Path, fmt: str, spec: GridSpec, timing: TimingParams, repetitions: int,
+                    min_sep: int, base_flights: Dict[str, Tuple[int, List[NodeId]]] | None) -> None:
+    base = BASE_FLIGHTS if base_flights is None else base_flights
+    F = generate_flight_intentions(repetitions, timing, base)
+    Sep_Nodes = generate_separation_nodes(base, min_sep=min_sep)
+    save_instance(filepath, fmt, F, Sep_Nodes, timing, grid=build_grid_csr(spec) if fmt == "binary" else None)
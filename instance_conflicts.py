@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from Instance_academic import FlightTable, NodeId, as_flight_table
+
+
+@dataclass
+class ConflictTable:
+    """
+    Pairs of flights that may pass the same node less than its separation
+    time apart.
+
+    Conflict ``k`` is between rows ``flight_a[k] < flight_b[k]`` of
+    ``flights`` at node ``flights.node_labels[node[k]]``. Rows are sorted by
+    node, then flight pair.
+    """
+    flights: FlightTable
+    node: np.ndarray                   # (k,) int32, node index
+    flight_a: np.ndarray               # (k,) int64, flight row
+    flight_b: np.ndarray               # (k,) int64, flight row
+
+    def __len__(self) -> int:
+        return len(self.node)
+
+    def pairs(self) -> List[Tuple[str, str, NodeId]]:
+        """Conflicts as ``(flight_id, flight_id, node_id)`` triples."""
+        ids = self.flights.flight_ids()
+        labels = self.flights.node_labels
+        return [(ids[a], ids[b], labels[n])
+                for n, a, b in zip(self.node.tolist(), self.flight_a.tolist(), self.flight_b.tolist())]
+
+    def by_node(self) -> Dict[NodeId, List[Tuple[str, str]]]:
+        """Conflicting flight id pairs grouped by node id."""
+        out: Dict[NodeId, List[Tuple[str, str]]] = {}
+        for a, b, node in self.pairs():
+            out.setdefault(node, []).append((a, b))
+        return out
+
+
+def _flight_rows(table: FlightTable) -> np.ndarray:
+    # Flight row of every entry of the flat path arrays
+    return np.repeat(np.arange(len(table), dtype=np.int64), np.diff(table.path_offsets))
+
+
+@dataclass
+class NodeIntervalIndex:
+    """
+    Per-node index of the ``[t_min, t_max]`` windows of a ``FlightTable``.
+
+    The passages through node index ``n`` are entries
+    ``offsets[n]:offsets[n + 1]``, sorted by ``t_min``. ``max_width[n]``
+    bounds ``t_max - t_min`` at that node, so a window query only scans the
+    passages starting in ``[a - max_width[n], b]``: O(log P + S) for the S
+    scanned passages. S is close to the number of hits when the windows at
+    a node have similar widths, but one wide window (e.g. of a slow
+    ``FleetTiming`` class) widens the scan at its node, up to every passage.
+    Labels added after ``flights.node_labels`` was indexed (e.g. the grid
+    nodes of a binary instance) have no passages.
+    """
+    flights: FlightTable
+    offsets: np.ndarray                # (nodes + 1,) int64
+    t_min: np.ndarray                  # (P,) float64, sorted within each node
+    t_max: np.ndarray                  # (P,) float64
+    flight: np.ndarray                 # (P,) int64, flight row of each passage
+    max_width: np.ndarray              # (nodes,) float64
+    _node_index: Dict[NodeId, int] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, F: FlightTable | Dict[str, Dict[str, object]],
+              timing_params: Dict[str, Dict[str, object]] | None = None) -> "NodeIntervalIndex":
+        """Index ``F`` (columnar or dict layout, see ``as_flight_table``)."""
+        table = as_flight_table(F, timing_params)
+        order = np.lexsort((table.t_min, table.path_nodes))
+        node = table.path_nodes[order]
+        n_nodes = len(table.node_labels)
+
+        offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(node, minlength=n_nodes), out=offsets[1:])
+        t_min, t_max = table.t_min[order], table.t_max[order]
+        max_width = np.zeros(n_nodes, dtype=np.float64)
+        np.maximum.at(max_width, node, t_max - t_min)
+        return cls(flights=table, offsets=offsets, t_min=t_min, t_max=t_max,
+                   flight=_flight_rows(table)[order], max_width=max_width)
+
+    def node_index(self, node: NodeId) -> int:
+        if self._node_index is None:
+            self._node_index = {n: i for i, n in enumerate(self.flights.node_labels)}
+        return self._node_index[node]
+
+    def query_rows(self, node: NodeId, a: float, b: float) -> np.ndarray:
+        """Sorted flight rows whose window at ``node`` intersects ``[a, b]``."""
+        n = self.node_index(node)
+        if n >= len(self.max_width):
+            return np.zeros(0, dtype=np.int64)
+        lo, hi = int(self.offsets[n]), int(self.offsets[n + 1])
+        starts = self.t_min[lo:hi]
+        first = lo + int(np.searchsorted(starts, a - self.max_width[n], side="left"))
+        last = lo + int(np.searchsorted(starts, b, side="right"))
+        hits = self.flight[first:last][self.t_max[first:last] >= a]
+        return np.unique(hits)
+
+    def query(self, node: NodeId, a: float, b: float) -> List[str]:
+        """Ids of the flights that may occupy ``node`` during ``[a, b]``."""
+        ids = self.flights.flight_idx
+        return [f"D{ids[r]}" for r in self.query_rows(node, a, b).tolist()]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The index arrays, keyed by field name (see ``from_arrays``)."""
+        return {"offsets": self.offsets, "t_min": self.t_min, "t_max": self.t_max,
+                "flight": self.flight, "max_width": self.max_width}
+
+    @classmethod
+    def from_arrays(cls, flights: FlightTable, arrays: Dict[str, np.ndarray]) -> "NodeIntervalIndex":
+        return cls(flights=flights, **arrays)
+
+
+def _node_separation(table: FlightTable, Sep_Nodes: Dict[NodeId, int]) -> np.ndarray:
+    # Separation per node index; NaN for nodes without a requirement
+    sep = np.full(len(table.node_labels), np.nan)
+    for i, node in enumerate(table.node_labels):
+        if node in Sep_Nodes:
+            sep[i] = Sep_Nodes[node]
+    return sep
+
+
+def _sweep_pairs(offsets: np.ndarray, start: np.ndarray, end: np.ndarray,
+                 margin: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairs of entries ``i < j`` of the same group with ``start[j] < end[i] +
+    margin[group]``, where group ``g`` holds entries ``offsets[g]:offsets[g + 1]``
+    sorted by ``start``. Only ``groups`` are swept. Returns (group, i, j).
+    """
+    sizes = np.diff(offsets)[groups]
+    # Positions of the swept entries, in index order
+    entries = np.repeat(offsets[groups] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+    # The partners of swept entry k are k + 1 .. hi[k] - 1
+    hi = np.empty(len(entries), dtype=np.int64)
+    pos = 0
+    for g, size in zip(groups.tolist(), sizes.tolist()):
+        lo, up = int(offsets[g]), int(offsets[g + 1])
+        hi[pos:pos + size] = pos + np.searchsorted(start[lo:up], end[lo:up] + margin[g], side="left")
+        pos += size
+
+    counts = np.maximum(hi - np.arange(len(entries)) - 1, 0)
+    first = np.repeat(np.arange(len(entries)), counts)
+    run = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + run
+    return np.repeat(groups, sizes)[first], entries[first], entries[second]
+
+
+def _unique_rows(*columns: np.ndarray) -> np.ndarray:
+    """
+    Indices of the distinct rows of the integer ``columns``, in
+    lexicographic row order: ``np.unique(np.stack(columns, axis=1), axis=0)``
+    without the structured-row sort.
+    """
+    order = np.lexsort(columns[::-1])
+    if len(order) == 0:
+        return order
+    new = np.zeros(len(order), dtype=bool)
+    new[0] = True
+    for column in columns:
+        c = column[order]
+        new[1:] |= c[1:] != c[:-1]
+    return order[new]
+
+
+def find_conflicts(F: FlightTable | Dict[str, Dict[str, object]],
+                   Sep_Nodes: Dict[NodeId, int],
+                   timing_params: Dict[str, Dict[str, object]] | None = None,
+                   index: NodeIntervalIndex | None = None) -> ConflictTable:
+    """
+    Find every pair of flights whose windows at a common node can be less
+    than the node's separation apart, i.e. ``t_min_i - t_max_j < sep`` and
+    ``t_min_j - t_max_i < sep``. Nodes missing from ``Sep_Nodes`` are not
+    checked.
+
+    The passages through each node are sorted by ``t_min`` (see
+    ``NodeIntervalIndex``); the partners of a passage are then the
+    contiguous run of later passages starting before its ``t_max + sep``,
+    found by binary search. The cost is O(P log P + K) for P node passages
+    and K conflicts, instead of all pairs.
+
+    Parameters
+    ----------
+    F : FlightTable or dict
+        Flight intentions, columnar or in the dict layout of
+        ``generate_flight_intentions``.
+    Sep_Nodes : dict
+        Separation times per node, as from ``generate_separation_nodes``.
+    timing_params : dict, optional
+        Top-level "TimingParams" section; required for dict-layout flights
+        that use ``params_ref``.
+    index : NodeIntervalIndex, optional
+        Prebuilt index of ``F`` (e.g. loaded with the instance); ``F`` is
+        then not read.
+
+    Returns
+    -------
+    ConflictTable
+    """
+    index = NodeIntervalIndex.build(F, timing_params) if index is None else index
+    # Labels past the indexed nodes (e.g. grid nodes of a binary instance) have no passages
+    sep = _node_separation(index.flights, Sep_Nodes)[:len(index.max_width)]
+
+    # A separation of 0 still flags overlapping windows; only missing nodes are skipped
+    checked = np.flatnonzero(~np.isnan(sep) & (sep >= 0))
+    node, first, second = _sweep_pairs(index.offsets, index.t_min, index.t_max, sep, checked)
+
+    a, b = index.flight[first], index.flight[second]
+    keep = a != b                      # a path may visit a node twice
+    pair_node = node[keep]
+    a, b = np.minimum(a, b)[keep], np.maximum(a, b)[keep]
+
+    # One conflict per (node, flight pair), even with repeated visits
+    rows = _unique_rows(pair_node, a, b)
+    return ConflictTable(flights=index.flights,
+                         node=pair_node[rows].astype(np.int32),
+                         flight_a=a[rows],
+                         flight_b=b[rows])
+
+
+@dataclass
+class ArcWindows:
+    """
+    Per-arc occupancy windows of a ``FlightTable``.
+
+    Traversal ``k`` is flight row ``flight[k]`` flying the arc
+    ``src[k] -> dst[k]`` (node indices), entering during
+    ``[entry_min[k], entry_max[k]]`` and leaving during
+    ``[exit_min[k], exit_max[k]]``, i.e. the windows of its two end nodes.
+    """
+    flights: FlightTable
+    flight: np.ndarray                 # (A,) int64, flight row
+    src: np.ndarray                    # (A,) int32
+    dst: np.ndarray                    # (A,) int32
+    entry_min: np.ndarray              # (A,) float64
+    entry_max: np.ndarray              # (A,) float64
+    exit_min: np.ndarray               # (A,) float64
+    exit_max: np.ndarray               # (A,) float64
+
+    def __len__(self) -> int:
+        return len(self.flight)
+
+    @classmethod
+    def build(cls, F: FlightTable | Dict[str, Dict[str, object]],
+              timing_params: Dict[str, Dict[str, object]] | None = None) -> "ArcWindows":
+        """Derive the arc windows of ``F`` (columnar or dict layout)."""
+        table = as_flight_table(F, timing_params)
+        rows = _flight_rows(table)
+        # Consecutive path entries of the same flight form an arc
+        k = np.flatnonzero(rows[:-1] == rows[1:])
+        return cls(flights=table, flight=rows[k],
+                   src=table.path_nodes[k], dst=table.path_nodes[k + 1],
+                   entry_min=table.t_min[k], entry_max=table.t_max[k],
+                   exit_min=table.t_min[k + 1], exit_max=table.t_max[k + 1])
+
+
+@dataclass
+class ArcConflictTable:
+    """
+    Pairs of flights that may share an arc at the same time.
+
+    Conflict ``k`` is between rows ``flight_a[k] < flight_b[k]`` of
+    ``flights`` on the lattice edge ``{arc_u[k], arc_v[k]}`` (node indices,
+    ``arc_u < arc_v``); ``opposite[k]`` marks head-on conflicts, where the
+    two flights fly ``(u, v)`` and ``(v, u)``, and is False for same-direction
+    (trailing or overtaking) conflicts.
+    """
+    flights: FlightTable
+    arc_u: np.ndarray                  # (k,) int32
+    arc_v: np.ndarray                  # (k,) int32
+    flight_a: np.ndarray               # (k,) int64
+    flight_b: np.ndarray               # (k,) int64
+    opposite: np.ndarray               # (k,) bool
+
+    def __len__(self) -> int:
+        return len(self.flight_a)
+
+    def pairs(self) -> List[Tuple[str, str, Tuple[NodeId, NodeId], bool]]:
+        """Conflicts as ``(flight_id, flight_id, (u, v), opposite)`` tuples."""
+        ids = self.flights.flight_ids()
+        labels = self.flights.node_labels
+        return [(ids[a], ids[b], (labels[u], labels[v]), o)
+                for u, v, a, b, o in zip(self.arc_u.tolist(), self.arc_v.tolist(), self.flight_a.tolist(),
+                                         self.flight_b.tolist(), self.opposite.tolist())]
+
+
+def find_arc_conflicts(F: FlightTable | Dict[str, Dict[str, object]],
+                       timing_params: Dict[str, Dict[str, object]] | None = None,
+                       sep: float = 0.0,
+                       arcs: ArcWindows | None = None) -> ArcConflictTable:
+    """
+    Find every pair of flights whose occupancy of a lattice edge, from
+    earliest entry ``entry_min`` to latest exit ``exit_max``, can come less
+    than ``sep`` apart, in the same direction or head-on. Arcs ``(u, v)``
+    and ``(v, u)`` are indexed together and swept like ``find_conflicts``.
+
+    Parameters
+    ----------
+    F : FlightTable or dict
+        Flight intentions, columnar or in the dict layout of
+        ``generate_flight_intentions``.
+    timing_params : dict, optional
+        Top-level "TimingParams" section; required for dict-layout flights
+        that use ``params_ref``.
+    sep : float
+        Extra separation time between two occupancies of the same edge.
+    arcs : ArcWindows, optional
+        Prebuilt arc windows of ``F``; ``F`` is then not read.
+
+    Returns
+    -------
+    ArcConflictTable
+    """
+    arcs = ArcWindows.build(F, timing_params) if arcs is None else arcs
+    n_nodes = len(arcs.flights.node_labels)
+    u = np.minimum(arcs.src, arcs.dst).astype(np.int64)
+    v = np.maximum(arcs.src, arcs.dst).astype(np.int64)
+    keys, edge = np.unique(u * n_nodes + v, return_inverse=True)
+
+    order = np.lexsort((arcs.entry_min, edge))
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge, minlength=len(keys)), out=offsets[1:])
+    margin = np.full(len(keys), float(sep))
+    _, first, second = _sweep_pairs(offsets, arcs.entry_min[order], arcs.exit_max[order],
+                                    margin, np.arange(len(keys)))
+    first, second = order[first], order[second]
+
+    a, b = arcs.flight[first], arcs.flight[second]
+    keep = a != b
+    first, second = first[keep], second[keep]
+    a, b = np.minimum(a, b)[keep], np.maximum(a, b)[keep]
+    opposite = arcs.src[first] != arcs.src[second]
+
+    # One conflict per (edge, flight pair, kind), even with repeated traversals
+    pair_edge = edge[first]
+    rows = _unique_rows(pair_edge, a, b, opposite)
+    pair_keys = keys[pair_edge[rows]]
+    return ArcConflictTable(flights=arcs.flights,
+                            arc_u=(pair_keys // n_nodes).astype(np.int32),
+                            arc_v=(pair_keys % n_nodes).astype(np.int32),
+                            flight_a=a[rows],
+                            flight_b=b[rows],
+                            opposite=opposite[rows])
+
+
+def _flown_degree(table: FlightTable) -> np.ndarray:
+    # Distinct neighbours of each node over the arcs flown by any flight
+    rows = _flight_rows(table)
+    k = np.flatnonzero(rows[:-1] == rows[1:])
+    u, v = table.path_nodes[k].astype(np.int64), table.path_nodes[k + 1].astype(np.int64)
+    n_nodes = len(table.node_labels)
+    edges = np.unique(np.minimum(u, v) * n_nodes + np.maximum(u, v))
+    return np.bincount(np.r_[edges // n_nodes, edges % n_nodes], minlength=n_nodes)
+
+
+def _crossing_streams(table: FlightTable) -> np.ndarray:
+    # Distinct incoming directions (predecessor node, or departure) at each node
+    rows = _flight_rows(table)
+    starts = np.r_[True, rows[1:] != rows[:-1]]
+    pred = np.r_[-1, table.path_nodes[:-1]].astype(np.int64)
+    pred[starts] = -1
+    n_nodes = len(table.node_labels)
+    moves = np.unique(table.path_nodes.astype(np.int64) * (n_nodes + 1) + pred + 1)
+    return np.bincount(moves // (n_nodes + 1), minlength=n_nodes)
+
+
+def contested_separation_nodes(F: FlightTable | Dict[str, Dict[str, object]],
+                               min_sep: int = 16,
+                               timing_params: Dict[str, Dict[str, object]] | None = None,
+                               scale: str | None = None) -> Dict[NodeId, int]:
+    """
+    Sep_Nodes restricted to contested nodes: those where at least two
+    flights of ``F`` can pass less than the node's (possibly scaled)
+    separation apart (see ``find_conflicts``). Nodes only ever used by one flight at a time get
+    no separation constraint.
+
+    Parameters
+    ----------
+    F : FlightTable or dict
+        Generated flight intentions (not the templates).
+    min_sep : int
+        Base separation time.
+    timing_params : dict, optional
+        Top-level "TimingParams" section; required for dict-layout flights
+        that use ``params_ref``.
+    scale : {None, "degree", "crossings"}
+        Scale ``min_sep`` per node: by half the number of distinct
+        neighbours of the node over the flown arcs (2 on a straight
+        segment), or by the number of distinct incoming streams, counting
+        departures as one. The result is rounded to an int.
+
+    Returns
+    -------
+    dict
+        Sep_Nodes mapping node_id -> separation_time (int), in order of
+        first appearance in ``F``.
+    """
+    table = as_flight_table(F, timing_params)
+    if scale is None:
+        factor = np.ones(len(table.node_labels))
+    elif scale == "degree":
+        factor = _flown_degree(table) / 2
+    elif scale == "crossings":
+        factor = _crossing_streams(table).astype(np.float64)
+    else:
+        raise ValueError(f"unknown scale {scale!r}; expected None, 'degree' or 'crossings'")
+
+    # Nodes are contested under their own scaled separation, not the base one
+    labels = table.node_labels
+    scaled = {node: int(round(min_sep * max(f, 1.0))) for node, f in zip(labels, factor.tolist())}
+    conflicts = find_conflicts(table, scaled, index=NodeIntervalIndex.build(table))
+    return {labels[n]: scaled[labels[n]] for n in np.unique(conflicts.node).tolist()}
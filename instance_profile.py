@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, TextIO
+
+# Set to a non-empty value other than "0" to enable profiling by default
+PROFILE_ENV = "INSTANCE_PROFILE"
+
+
+@dataclass
+class StageStats:
+    """Measurements of one pipeline stage."""
+    name: str
+    seconds: float = 0.0
+    blocks: int = 0                    # net memory blocks allocated (~ objects created)
+    counters: Dict[str, float] = field(default_factory=dict)
+
+    def count(self, **counters: float) -> None:
+        """Add to named counters, e.g. ``stage.count(flights=len(F), bytes=size)``."""
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def rate(self, counter: str) -> float | None:
+        """``counter`` per second, e.g. flights/s."""
+        if counter not in self.counters or self.seconds <= 0:
+            return None
+        return self.counters[counter] / self.seconds
+
+
+class _Stage:
+    __slots__ = ("_stats", "_start", "_blocks")
+
+    def __init__(self, stats: StageStats) -> None:
+        self._stats = stats
+
+    def __enter__(self) -> StageStats:
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+        return self._stats
+
+    def __exit__(self, *exc: object) -> None:
+        self._stats.seconds += time.perf_counter() - self._start
+        self._stats.blocks += sys.getallocatedblocks() - self._blocks
+
+
+class _NullStage:
+    # Shared by every stage of a disabled profiler: no timing, counters dropped
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def count(self, **counters: float) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Per-stage timers and counters for the generation pipeline::
+
+        profiler = Profiler()
+        with profiler.stage("generate_flight_intentions") as stage:
+            F = generate_flight_intentions(...)
+            stage.count(flights=len(F))
+        profiler.report()
+
+    Each stage records its elapsed time, the net number of memory blocks it
+    allocated and any counters it adds. ``enabled`` defaults to the
+    ``INSTANCE_PROFILE`` environment variable; when disabled, ``stage``
+    returns a shared no-op context and nothing is measured.
+    """
+
+    def __init__(self, enabled: bool | None = None) -> None:
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+        self.enabled = enabled
+        self.stages: List[StageStats] = []
+
+    def stage(self, name: str) -> _Stage | _NullStage:
+        if not self.enabled:
+            return _NULL_STAGE
+        stats = StageStats(name)
+        self.stages.append(stats)
+        return _Stage(stats)
+
+    def as_dict(self) -> List[Dict[str, object]]:
+        return [{"stage": s.name, "seconds": s.seconds, "blocks": s.blocks, **s.counters}
+                for s in self.stages]
+
+    def report(self, file: TextIO | None = None) -> None:
+        """Print one line per stage (to stderr by default); no-op when disabled."""
+        if not self.enabled:
+            return
+        file = sys.stderr if file is None else file
+        total = sum(s.seconds for s in self.stages)
+        for s in self.stages:
+            parts = [f"{s.name:<28} {s.seconds * 1e3:10.2f} ms  {s.blocks:+10d} blocks"]
+            for name, value in s.counters.items():
+                parts.append(f"{name}={value:.0f}" if float(value).is_integer() else f"{name}={value:g}")
+                rate = s.rate(name)
+                if name == "flights" and rate is not None:
+                    parts.append(f"flights/s={rate:.0f}")
+            print("  ".join(parts), file=file)
+        print(f"{'total':<28} {total * 1e3:10.2f} ms", file=file)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from Instance_academic import (BASE_FLIGHTS, INSTANCE_FORMATS, TIMING_FIELD_TYPES, GridCSR, GridSpec, TimingParams,
+                               build_grid_csr, generate_instance_family, generate_separation_nodes, save_instance)
+from instance_cache import instance_key
+
+MANIFEST_NAME = "manifest.json"
+
+_TIMING_FIELDS = tuple(TIMING_FIELD_TYPES)
+
+DEFAULT_TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4.0,
+    v_max=10.0,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One instance of a sweep."""
+    timing: TimingParams
+    repetitions: int
+    min_sep: int
+    name: str                          # file stem, from the swept values
+
+
+def _timing_values(values: Dict[str, object]) -> Dict[str, object]:
+    # JSON and literals give 4 for 4.0; cast so equal timings compare and serialize equally
+    return {k: TIMING_FIELD_TYPES[k](v) for k, v in values.items() if k in TIMING_FIELD_TYPES}
+
+
+def expand_sweep(params: Dict[str, Sequence[object]],
+                 timing: TimingParams = DEFAULT_TIMING,
+                 repetitions: int = 1,
+                 min_sep: int = 28) -> List[SweepPoint]:
+    """
+    Cartesian product of ``params``, whose keys are ``TimingParams`` fields,
+    ``repetitions`` or ``min_sep``; unswept values come from the other
+    arguments. Each point is named after its swept values, e.g.
+    ``v_min=4__repetitions=10``.
+    """
+    unknown = set(params) - set(_TIMING_FIELDS) - {"repetitions", "min_sep"}
+    if unknown:
+        raise ValueError(f"unknown sweep parameters {sorted(unknown)}")
+    keys = list(params)
+    points = []
+    for values in itertools.product(*(params[k] for k in keys)):
+        point = dict(zip(keys, values))
+        point_timing = replace(timing, **_timing_values(point))
+        name = "__".join(f"{k}={v}" for k, v in point.items()) or "instance"
+        points.append(SweepPoint(timing=point_timing,
+                                 repetitions=int(point.get("repetitions", repetitions)),
+                                 min_sep=int(point.get("min_sep", min_sep)),
+                                 name=name))
+    return points
+
+
+@lru_cache(maxsize=None)
+def _grid(spec: GridSpec) -> GridCSR:
+    # One grid per GridSpec and worker process
+    return build_grid_csr(spec)
+
+
+def _write_instance(path: Path, fmt: str, F: Dict[str, Dict[str, object]], Sep_Nodes: Dict[object, int],
+                    timing: TimingParams, spec: GridSpec) -> None:
+    # Write to a temporary name first, so an existing output is always complete
+    tmp = path.with_name(path.name + ".tmp")
+    save_instance(tmp, fmt, F, Sep_Nodes, timing, grid=_grid(spec) if fmt == "binary" else None)
+    os.replace(tmp, path)
+
+
+def _run_group(spec: GridSpec, timing: TimingParams,
+               jobs: List[Tuple[int, int, str, str, str]], fmt: str, engine: str) -> List[Dict[str, object]]:
+    # All points sharing timing: flights are generated once for the largest count,
+    # Sep_Nodes once per min_sep (it does not depend on the flights' timing)
+    entries = []
+    counts = sorted({reps for reps, _, _, _, _ in jobs})
+    family = {n: F for n, F, _ in generate_instance_family(counts, timing, BASE_FLIGHTS, engine=engine)}
+    separations = {m: generate_separation_nodes(BASE_FLIGHTS, min_sep=m) for m in {m for _, m, _, _, _ in jobs}}
+    for reps, min_sep, name, path, key in jobs:
+        F, Sep_Nodes = family[reps], separations[min_sep]
+        _write_instance(Path(path), fmt, F, Sep_Nodes, timing, spec)
+        entries.append(_manifest_entry(name, Path(path), key, timing, reps, min_sep, len(F), "generated"))
+    return entries
+
+
+def _manifest_entry(name: str, path: Path, key: str, timing: TimingParams, repetitions: int, min_sep: int,
+                    flights: int | None, status: str) -> Dict[str, object]:
+    return {
+        "name": name,
+        "path": path.name,
+        "key": key,
+        "timing": asdict(timing),
+        "repetitions": repetitions,
+        "min_sep": min_sep,
+        "flights": flights,
+        "bytes": path.stat().st_size,
+        "status": status,
+    }
+
+
+def _write_manifest(out_dir: Path, spec: GridSpec, entries: List[Dict[str, object]]) -> None:
+    manifest = {"grid": asdict(spec), "instances": sorted(entries, key=lambda e: e["name"])}
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+
+
+def _manifest_keys(out_dir: Path) -> Dict[str, str]:
+    # Input key of every file listed by an earlier run's manifest
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {e["path"]: e["key"] for e in manifest.get("instances", []) if "key" in e}
+
+
+def run_sweep(points: List[SweepPoint],
+              out_dir: Path,
+              spec: GridSpec = GridSpec(rows=9, cols=8, edge_length=60.0),
+              fmt: str = "json",
+              engine: str = "python",
+              workers: int | None = None) -> List[Dict[str, object]]:
+    """
+    Generate every sweep point into ``out_dir`` and write ``manifest.json``.
+
+    Points sharing ``timing`` form one job that generates flights once, for
+    its largest repetition count (see ``generate_instance_family``), and
+    ``Sep_Nodes`` once per ``min_sep``; jobs run in a process pool and each
+    worker builds the grid of ``spec`` at most once. Outputs are written
+    atomically, and the manifest records each file's ``instance_key``, so a
+    rerun skips an instance only if its file exists and was generated from
+    the same inputs (grid, timing, repetitions, ``min_sep`` and format);
+    any other file of the same name is regenerated. Returns the manifest
+    entries.
+    """
+    if fmt not in INSTANCE_FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {sorted(INSTANCE_FORMATS)}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = _manifest_keys(out_dir)
+    entries: List[Dict[str, object]] = []
+    groups: Dict[TimingParams, List[Tuple[int, int, str, str, str]]] = {}
+    for point in points:
+        path = out_dir / (point.name + INSTANCE_FORMATS[fmt])
+        key = instance_key(spec, point.timing, point.repetitions, point.min_sep, fmt=fmt)
+        if path.exists() and previous.get(path.name) == key:
+            entries.append(_manifest_entry(point.name, path, key, point.timing, point.repetitions, point.min_sep,
+                                           point.repetitions * len(BASE_FLIGHTS), "skipped"))
+            continue
+        groups.setdefault(point.timing, []).append((point.repetitions, point.min_sep, point.name, str(path), key))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_group, spec, timing, jobs, fmt, engine) for timing, jobs in groups.items()]
+        for future in as_completed(futures):
+            entries.extend(future.result())
+            # Keep the manifest current, so an interrupted sweep still lists its outputs
+            _write_manifest(out_dir, spec, entries)
+    _write_manifest(out_dir, spec, entries)
+    return entries
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    Run a sweep described by a JSON file::
+
+        {"grid": {"rows": 9, "cols": 8, "edge_length": 60.0},
+         "timing": {"v_min": 4, "v_max": 10},
+         "repetitions": 1, "min_sep": 28,
+         "sweep": {"v_min": [3, 4, 5], "repetitions": [1, 10, 100]}}
+
+    ``grid``, ``timing`` and the fixed values default to the example instance.
+    """
+    parser = argparse.ArgumentParser(description="Generate a parameter sweep of instances.")
+    parser.add_argument("config", type=Path, help="sweep description (JSON)")
+    parser.add_argument("--output-dir", type=Path, default=Path("sweep"))
+    parser.add_argument("--format", choices=sorted(INSTANCE_FORMATS), default="json")
+    parser.add_argument("--engine", choices=("python", "numpy"), default="python")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    config = json.loads(args.config.read_text(encoding="utf-8"))
+    spec = GridSpec(**{"rows": 9, "cols": 8, "edge_length": 60.0, **config.get("grid", {})})
+    unknown = set(config.get("timing", {})) - set(_TIMING_FIELDS)
+    if unknown:
+        parser.error(f"unknown timing parameters {sorted(unknown)}")
+    timing = replace(DEFAULT_TIMING, **_timing_values(config.get("timing", {})))
+    points = expand_sweep(config.get("sweep", {}), timing,
+                          repetitions=config.get("repetitions", 1), min_sep=config.get("min_sep", 28))
+    entries = run_sweep(points, args.output_dir, spec, args.format, args.engine, args.workers)
+
+    generated = sum(e["status"] == "generated" for e in entries)
+    print(f"{generated} generated, {len(entries) - generated} skipped; "
+          f"manifest written to: {(args.output_dir / MANIFEST_NAME).resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
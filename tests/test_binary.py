@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from Instance_academic import (BASE_FLIGHTS, FleetTiming, GridSpec, TimingParams, build_grid_csr, create_graph,
+                               generate_flight_intentions, generate_separation_nodes, int_node_ids, save_instance,
+                               timing_params_section)
+from instance_binary import load_instance_binary, open_flight_intentions, read_arrays, save_instance_binary
+
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4,
+    v_max=10,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+FLEET = FleetTiming((TIMING, TimingParams(60.0, 2.0, 5.0, 60.0, 2, 45.0)), (0, 1, 1, 0, 1))
+
+
+def _edges(G):
+    if G.is_directed():
+        return {(u, v, d["length"]) for u, v, d in G.edges(data=True)}
+    return {(frozenset((u, v)), d["length"]) for u, v, d in G.edges(data=True)}
+
+
+def _assert_same_graph(G, H):
+    assert G.is_directed() == H.is_directed()
+    assert G.graph == H.graph
+    assert dict(G.nodes(data=True)) == dict(H.nodes(data=True))
+    assert _edges(G) == _edges(H)
+
+
+@pytest.mark.parametrize("int_ids", [False, True])
+@pytest.mark.parametrize("timing", [TIMING, FLEET])
+@pytest.mark.parametrize("layout", ["dict", "columnar"])
+def test_flights_round_trip(tmp_path, int_ids, timing, layout):
+    base = int_node_ids(BASE_FLIGHTS) if int_ids else BASE_FLIGHTS
+    F = generate_flight_intentions(4, timing, base)
+    Sep_Nodes = generate_separation_nodes(base, min_sep=28)
+    section = timing_params_section(timing)
+    flights = F if layout == "dict" else generate_flight_intentions(4, timing, base, layout="columnar")
+    out = tmp_path / "instance.bin"
+    save_instance_binary(out, flights, Sep_Nodes, section)
+
+    loaded = load_instance_binary(out)
+    # Classes of a FleetTiming are stored per flight, in the timing_class column
+    if isinstance(timing, FleetTiming):
+        assert loaded.flights.timing.classes == timing.classes
+        assert loaded.flights.timing_class.tolist() == list(timing.class_of) * 4
+    else:
+        assert loaded.flights.timing == timing
+    assert loaded.timing_params == section
+    assert loaded.sep_nodes_dict() == Sep_Nodes
+    assert list(loaded.sep_nodes_dict()) == list(Sep_Nodes)
+    assert loaded.grid is None
+    view = open_flight_intentions(out)
+    assert list(view) == list(F)
+    assert view == F
+    assert dict(load_instance_binary(out, mmap_mode=False).flight_view()) == F
+
+
+@pytest.mark.parametrize("int_ids", [False, True])
+@pytest.mark.parametrize("directed", [True, False])
+@pytest.mark.parametrize("kind", ["csr", "networkx"])
+def test_grid_round_trip(tmp_path, int_ids, directed, kind):
+    spec = GridSpec(rows=9, cols=8, edge_length=60.0, directed=directed)
+    base = int_node_ids(BASE_FLIGHTS) if int_ids else BASE_FLIGHTS
+    F = generate_flight_intentions(2, TIMING, base)
+    grid = build_grid_csr(spec) if kind == "csr" else create_graph(spec, int_ids)
+    out = tmp_path / "instance.bin"
+    save_instance_binary(out, F, generate_separation_nodes(base), timing_params_section(TIMING), grid=grid)
+
+    loaded = load_instance_binary(out)
+    coord_to_id, G = loaded.graph()
+    expected_coords, expected_G = create_graph(spec, int_ids)
+    assert coord_to_id == expected_coords
+    _assert_same_graph(G, expected_G)
+    assert loaded.flight_view() == F
+
+
+def test_empty_instance_round_trip(tmp_path):
+    F = generate_flight_intentions(3, TIMING, {})
+    out = tmp_path / "instance.bin"
+    save_instance_binary(out, F, {}, timing_params_section(TIMING))
+
+    loaded = load_instance_binary(out)
+    assert len(loaded.flights) == 0
+    assert loaded.sep_nodes_dict() == {}
+    assert dict(loaded.flight_view()) == {}
+
+
+def test_node_id_modes_save_identically(tmp_path):
+    # JSON files never depend on the id mode or engine; binary ones only flag integer ids in their meta
+    spec = GridSpec(rows=9, cols=8, edge_length=60.0)
+    files = {}
+    for engine in ("python", "numpy"):
+        for int_ids in (False, True):
+            base = int_node_ids(BASE_FLIGHTS) if int_ids else BASE_FLIGHTS
+            F = generate_flight_intentions(3, TIMING, base, engine=engine)
+            Sep_Nodes = generate_separation_nodes(base, min_sep=28)
+            for fmt in ("json", "jsonl", "binary"):
+                out = tmp_path / f"{engine}-{int_ids}.{fmt}"
+                save_instance(out, fmt, F, Sep_Nodes, TIMING, grid=build_grid_csr(spec))
+                files[engine, int_ids, fmt] = out.read_bytes()
+
+    for fmt in ("json", "jsonl"):
+        assert len({data for (_, _, f), data in files.items() if f == fmt}) == 1
+    for int_ids in (False, True):
+        assert files["python", int_ids, "binary"] == files["numpy", int_ids, "binary"]
+    str_arrays, str_meta = read_arrays(tmp_path / "python-False.binary")
+    int_arrays, int_meta = read_arrays(tmp_path / "python-True.binary")
+    assert str_arrays.keys() == int_arrays.keys()
+    for name, array in str_arrays.items():
+        np.testing.assert_array_equal(array, int_arrays[name])
+    assert {**str_meta, "int_ids": True} == int_meta
@@ -0,0 +1,91 @@
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+import instance_cache
+from Instance_academic import BASE_FLIGHTS, GridSpec, TimingParams
+from instance_cache import InstanceCache, instance_key
+
+SPEC = GridSpec(rows=9, cols=8, edge_length=60.0)
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4.0,
+    v_max=10.0,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+
+
+def test_key_covers_every_input():
+    key = instance_key(SPEC, TIMING, 3, 16)
+    assert key == instance_key(SPEC, replace(TIMING), 3, 16, dict(BASE_FLIGHTS), "json")
+    variants = [
+        instance_key(replace(SPEC, directed=False), TIMING, 3, 16),
+        instance_key(SPEC, replace(TIMING, v_max=11.0), 3, 16),
+        instance_key(SPEC, replace(TIMING, v_min=4), 3, 16),       # written as 4, not 4.0
+        instance_key(SPEC, TIMING, 4, 16),
+        instance_key(SPEC, TIMING, 3, 17),
+        instance_key(SPEC, TIMING, 3, 16, {"D1": BASE_FLIGHTS["D1"]}),
+        instance_key(SPEC, TIMING, 3, 16, fmt="binary"),
+    ]
+    assert len({key, *variants}) == len(variants) + 1
+
+
+def _count_writes(monkeypatch):
+    calls = []
+    write = instance_cache._write_instance
+
+    def counted(*args):
+        calls.append(args)
+        write(*args)
+
+    monkeypatch.setattr(instance_cache, "_write_instance", counted)
+    return calls
+
+
+def test_hit_reuses_the_generated_file(tmp_path, monkeypatch):
+    calls = _count_writes(monkeypatch)
+    cache = InstanceCache(tmp_path)
+    path = cache.get(SPEC, TIMING, 2)
+    assert len(calls) == 1
+    assert set(json.loads(path.read_text(encoding="utf-8"))) == {"F", "Sep_Nodes", "TimingParams"}
+
+    assert cache.get(SPEC, TIMING, 2) == path
+    assert len(calls) == 1
+    cache.get(SPEC, TIMING, 3)
+    assert len(calls) == 2
+    assert len(cache.entries()) == 2
+
+
+def test_failed_write_leaves_no_entry(tmp_path, monkeypatch):
+    def failing(filepath, *args):
+        filepath.write_text("partial", encoding="utf-8")
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(instance_cache, "_write_instance", failing)
+    cache = InstanceCache(tmp_path)
+    with pytest.raises(RuntimeError):
+        cache.get(SPEC, TIMING, 2)
+    assert cache.entries() == []
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = InstanceCache(tmp_path)
+    paths = [cache.get(SPEC, TIMING, n) for n in (1, 2, 3)]
+    # Oldest first, then refresh the first entry with a hit
+    for age, path in enumerate(reversed(paths)):
+        os.utime(path, (1_000_000 - age * 100, 1_000_000 - age * 100))
+    assert cache.get(SPEC, TIMING, 1) == paths[0]
+
+    cache.max_bytes = paths[0].stat().st_size + paths[2].stat().st_size
+    assert cache.evict() == [paths[1]]
+    assert sorted(cache.entries()) == sorted([paths[0], paths[2]])
+
+    # A new entry is kept even when it alone exceeds the budget
+    cache.max_bytes = 1
+    path = cache.get(SPEC, TIMING, 4)
+    assert cache.entries() == [path]
@@ -0,0 +1,84 @@
+import filecmp
+
+import pytest
+
+from Instance_academic import (BASE_FLIGHTS, GridSpec, INSTANCE_FORMATS, TimingParams, build_grid_csr,
+                               generate_flight_intentions, generate_separation_nodes, main, save_instance)
+
+# The command-line defaults, which write the speeds of the example instance as ints
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4,
+    v_max=10,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+
+
+def _run(tmp_path, name, *args):
+    out = tmp_path / name
+    assert main([*args, "--output", str(out)]) == 0
+    return out
+
+
+def test_random_flights_are_reproducible_by_default(tmp_path):
+    first = _run(tmp_path, "a.json", "--random-flights", "20")
+    second = _run(tmp_path, "b.json", "--random-flights", "20")
+    assert filecmp.cmp(first, second, shallow=False)
+    other = _run(tmp_path, "c.json", "--random-flights", "20", "--seed", "1")
+    assert not filecmp.cmp(first, other, shallow=False)
+
+
+def test_drone_classes_are_reproducible_by_default(tmp_path):
+    args = ("--repetitions", "2", "--drone-class", "v_min=2,v_max=6")
+    first = _run(tmp_path, "a.json", *args)
+    second = _run(tmp_path, "b.json", *args)
+    assert filecmp.cmp(first, second, shallow=False)
+
+
+@pytest.mark.parametrize("fmt", sorted(INSTANCE_FORMATS))
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_family_matches_library_output(tmp_path, fmt, engine):
+    suffix = INSTANCE_FORMATS[fmt]
+    pattern = str(tmp_path / ("cli_{repetitions}" + suffix))
+    assert main(["--repetitions", "1:5:2", "6", "--format", fmt, "--engine", engine, "--output", pattern]) == 0
+
+    spec = GridSpec(rows=9, cols=8, edge_length=60.0)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    written = sorted(p.name for p in tmp_path.iterdir())
+    assert written == sorted(f"cli_{n}{suffix}" for n in (1, 3, 5, 6))
+    for n in (1, 3, 5, 6):
+        expected = tmp_path / f"expected_{n}{suffix}"
+        save_instance(expected, fmt, generate_flight_intentions(n, TIMING), Sep_Nodes, TIMING,
+                      grid=build_grid_csr(spec))
+        assert (tmp_path / f"cli_{n}{suffix}").read_bytes() == expected.read_bytes()
+
+
+def test_default_output_name(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert main([]) == 0
+    assert main(["--repetitions", "2", "3", "--format", "jsonl"]) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "flight_data.json", "flight_data_2.jsonl", "flight_data_3.jsonl"]
+
+
+@pytest.mark.parametrize("args", [
+    ["--repetitions", "1", "2", "--output", "out.json"],       # several instances need {repetitions}
+    ["--repetitions", "0"],
+    ["--repetitions", "3:x"],
+    ["--drone-class", "speed=3"],
+    ["--workers", "2"],                                       # python engine
+])
+def test_invalid_arguments_exit(tmp_path, monkeypatch, args):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        main(args)
+    assert exc.value.code == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_reports_stages(tmp_path, capsys):
+    _run(tmp_path, "a.json", "--profile")
+    report = capsys.readouterr().err
+    assert "create_graph" in report and "generate_flight_intentions" in report and "total" in report
@@ -0,0 +1,96 @@
+import itertools
+
+from Instance_academic import (BASE_FLIGHTS, GridSpec, TimingParams, build_grid_csr, generate_flight_table,
+                               generate_separation_nodes)
+from instance_binary import load_instance_binary, save_instance_binary
+from instance_conflicts import (ArcWindows, NodeIntervalIndex, contested_separation_nodes, find_arc_conflicts,
+                                find_conflicts)
+
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4,
+    v_max=10,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+
+
+def _brute_force(table, Sep_Nodes):
+    F = table.to_dict()
+    found = set()
+    for (i, a), (j, b) in itertools.combinations(enumerate(F.values()), 2):
+        for na in a["node_times"]:
+            for nb in b["node_times"]:
+                if na["node"] != nb["node"] or na["node"] not in Sep_Nodes:
+                    continue
+                sep = Sep_Nodes[na["node"]]
+                if na["t_min"] - nb["t_max"] < sep and nb["t_min"] - na["t_max"] < sep:
+                    found.add((table.node_labels.index(na["node"]), i, j))
+    return found
+
+
+def _found(conflicts):
+    return set(zip(conflicts.node.tolist(), conflicts.flight_a.tolist(), conflicts.flight_b.tolist()))
+
+
+def test_conflicts_match_brute_force():
+    table = generate_flight_table(3, TIMING)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    assert _found(find_conflicts(table, Sep_Nodes)) == _brute_force(table, Sep_Nodes)
+
+
+def test_zero_separation_still_flags_overlaps():
+    table = generate_flight_table(3, TIMING)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=0)
+    expected = _brute_force(table, Sep_Nodes)
+    assert expected
+    assert _found(find_conflicts(table, Sep_Nodes)) == expected
+
+
+def test_scaled_separation_finds_contested_nodes():
+    # Point windows: the flights pass node 13 exactly 20 s apart
+    base = {"D1": (0, ["12", "13", "14"]), "D2": (20, ["5", "13", "21"])}
+    point = TimingParams(edge_length=60.0, v_min=10, v_max=10, ground_delay_max=0.0,
+                         n_flight_levels=1, climb_time_per_level=0.0)
+    table = generate_flight_table(1, point, base_flights=base)
+    assert contested_separation_nodes(table, 16) == {}
+    assert contested_separation_nodes(table, 16, scale="degree") == {"13": 32}
+    assert _found(find_conflicts(table, {"13": 32})) == {(table.node_labels.index("13"), 0, 1)}
+
+
+def test_reloaded_index_answers_unflown_grid_nodes(tmp_path):
+    table = generate_flight_table(3, TIMING)
+    index = NodeIntervalIndex.build(table)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    out = tmp_path / "instance.bin"
+    save_instance_binary(out, table, {**Sep_Nodes, "0": 28}, grid=build_grid_csr(GridSpec(rows=9, cols=8)),
+                         node_intervals=index)
+    loaded = load_instance_binary(out).node_intervals
+
+    assert "0" not in table.node_labels
+    assert loaded.query("0", 0.0, 1e9) == []
+    for node in table.node_labels:
+        assert loaded.query(node, 100.0, 400.0) == index.query(node, 100.0, 400.0)
+    assert _found(find_conflicts(table, {**Sep_Nodes, "0": 28}, index=loaded)) == _found(
+        find_conflicts(table, Sep_Nodes))
+
+
+def test_arc_conflicts_match_brute_force():
+    table = generate_flight_table(3, TIMING)
+    arcs = ArcWindows.build(table)
+    expected = set()
+    for i, j in itertools.combinations(range(len(arcs)), 2):
+        fa, fb = int(arcs.flight[i]), int(arcs.flight[j])
+        edge_i = tuple(sorted((int(arcs.src[i]), int(arcs.dst[i]))))
+        edge_j = tuple(sorted((int(arcs.src[j]), int(arcs.dst[j]))))
+        if fa == fb or edge_i != edge_j:
+            continue
+        if arcs.entry_min[j] < arcs.exit_max[i] + 5 and arcs.entry_min[i] < arcs.exit_max[j] + 5:
+            expected.add((*edge_i, min(fa, fb), max(fa, fb), bool(arcs.src[i] != arcs.src[j])))
+    conflicts = find_arc_conflicts(table, sep=5.0)
+    found = list(zip(conflicts.arc_u.tolist(), conflicts.arc_v.tolist(), conflicts.flight_a.tolist(),
+                     conflicts.flight_b.tolist(), conflicts.opposite.tolist()))
+    assert expected
+    assert found == sorted(set(found))
+    assert set(found) == expected
@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import Instance_academic
+from Instance_academic import (BASE_FLIGHTS, DensityOffsets, DepartureModel, FleetTiming, FlightTable, FlightView,
+                               GeometricOffsets, Jitter, RepetitionOffsets, TimingParams, generate_flight_intentions,
+                               generate_separation_nodes, iter_flight_intentions, save_results_as_json,
+                               timing_params_section)
+
+TIMING = TimingParams(
+    edge_length=60.0,
+    v_min=4,
+    v_max=10,
+    ground_delay_max=120.0,
+    n_flight_levels=2,
+    climb_time_per_level=30.0,
+)
+FLEET = FleetTiming((TIMING, TimingParams(60.0, 2.0, 5.0, 60.0, 2, 45.0)), (0, 1, 1, 0, 1))
+
+
+@pytest.mark.parametrize("inline_params", [False, True])
+@pytest.mark.parametrize("timing", [TIMING, FLEET])
+@pytest.mark.parametrize("departures", [None, Jitter(scale=20, seed=3)])
+def test_engines_agree(inline_params, timing, departures):
+    F_python = generate_flight_intentions(7, timing, inline_params=inline_params, departures=departures)
+    F_numpy = generate_flight_intentions(7, timing, engine="numpy", inline_params=inline_params,
+                                         departures=departures)
+    assert isinstance(F_numpy, FlightView)
+    assert list(F_numpy) == list(F_python)
+    assert F_numpy == F_python
+    table = generate_flight_intentions(7, timing, layout="columnar", departures=departures)
+    assert table.to_dict(inline_params=inline_params) == F_python
+
+
+@pytest.mark.parametrize("timing", [TIMING, FLEET])
+def test_parallel_matches_sequential(timing):
+    departures = Jitter(scale=20, seed=3)
+    parallel = generate_flight_intentions(9, timing, layout="columnar", workers=3, departures=departures)
+    sequential = generate_flight_intentions(9, timing, layout="columnar", departures=departures)
+    for name in ("flight_idx", "dep_time", "dep", "arr", "path_offsets", "path_nodes", "t_min", "t_max"):
+        np.testing.assert_array_equal(getattr(parallel, name), getattr(sequential, name))
+    assert generate_flight_intentions(9, timing, engine="numpy", workers=3) == generate_flight_intentions(9, timing)
+
+
+def test_python_engine_rejects_workers():
+    with pytest.raises(ValueError, match="workers"):
+        generate_flight_intentions(9, TIMING, workers=3)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_json_matches_json_dump(tmp_path: Path, engine):
+    F = generate_flight_intentions(12, TIMING, engine=engine)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    section = timing_params_section(TIMING)
+    out = tmp_path / "instance.json"
+    save_results_as_json(out, F=F, Sep_Nodes=Sep_Nodes, timing_params=section)
+    expected = json.dumps({"F": dict(F), "Sep_Nodes": Sep_Nodes, "TimingParams": section},
+                          indent=2, sort_keys=True, ensure_ascii=False)
+    assert out.read_text(encoding="utf-8") == expected
+
+
+def test_engines_write_identical_json(tmp_path: Path):
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    for engine in ("python", "numpy"):
+        save_results_as_json(tmp_path / f"{engine}.json", F=generate_flight_intentions(12, TIMING, engine=engine),
+                             Sep_Nodes=Sep_Nodes, timing_params=timing_params_section(TIMING))
+    assert (tmp_path / "python.json").read_bytes() == (tmp_path / "numpy.json").read_bytes()
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_no_base_flights(engine):
+    assert generate_flight_intentions(3, TIMING, base_flights={}, engine=engine) == {}
+    assert len(generate_flight_intentions(3, TIMING, base_flights={}, layout="columnar")) == 0
+
+
+def test_jsonl_defines_params_ref(tmp_path: Path):
+    from Instance_academic import (iter_flight_intentions, load_flight_intentions_jsonl, save_flight_intentions_jsonl,
+                                   save_flight_intentions_shards)
+    out = tmp_path / "flights.jsonl"
+    with pytest.raises(ValueError):
+        save_flight_intentions_jsonl(out, iter_flight_intentions(2, FLEET))
+    save_flight_intentions_jsonl(out, iter_flight_intentions(6, FLEET), timing_params_section(FLEET))
+    F, sections = load_flight_intentions_jsonl(out)
+    assert sections == {"TimingParams": timing_params_section(FLEET)}
+    assert F == generate_flight_intentions(6, FLEET)
+
+    shards = save_flight_intentions_shards(tmp_path / "shards", 6, FLEET, workers=2)
+    assert b"".join(p.read_bytes() for p in shards) == out.read_bytes()
+
+
+def test_jsonl_instance_is_complete(tmp_path: Path):
+    from Instance_academic import load_flight_intentions_jsonl, save_instance
+    F = generate_flight_intentions(4, FLEET)
+    Sep_Nodes = generate_separation_nodes(BASE_FLIGHTS, min_sep=28)
+    save_instance(tmp_path / "instance.jsonl", "jsonl", F, Sep_Nodes, FLEET)
+    loaded, sections = load_flight_intentions_jsonl(tmp_path / "instance.jsonl")
+    assert loaded == F
+    assert sections == {"Sep_Nodes": Sep_Nodes, "TimingParams": timing_params_section(FLEET)}
+
+
+def test_incomplete_departure_model_fails_on_construction():
+    class NoTimes(DepartureModel):
+        pass
+
+    with pytest.raises(TypeError):
+        NoTimes()
+
+
+def test_incomplete_repetition_offsets_fails_on_construction():
+    class NoOffsets(RepetitionOffsets):
+        pass
+
+    with pytest.raises(TypeError):
+        NoOffsets()
+
+
+@pytest.mark.parametrize("departures", [None, GeometricOffsets(ratio=1.01), DensityOffsets(3.0)])
+def test_streamed_offsets_match_generated(monkeypatch, departures):
+    monkeypatch.setattr(Instance_academic, "_STREAM_CHUNK", 3)
+    F = generate_flight_intentions(10, TIMING, departures=departures)
+    assert dict(iter_flight_intentions(10, TIMING, first_rep=2, departures=departures)) == {
+        fid: rec for fid, rec in F.items() if int(fid[1:]) > 2 * len(BASE_FLIGHTS)
+    }
+
+
+def test_streaming_does_not_precompute_all_repetitions():
+    # A full (repetitions, flights) array would not fit in memory
+    flight_id, _ = next(iter_flight_intentions(10 ** 13, TIMING))
+    assert flight_id == "D1"
+
+
+def test_view_decodes_across_blocks(monkeypatch):
+    monkeypatch.setattr(Instance_academic, "_DECODE_BLOCK", 4)
+    monkeypatch.setattr(FlightView, "_CACHED_BLOCKS", 2)
+    F_python = generate_flight_intentions(7, FLEET)
+    view = generate_flight_intentions(7, FLEET, engine="numpy")
+    assert {fid: view[fid] for fid in sorted(view)} == F_python
+    assert list(view.items()) == list(F_python.items())
+    assert list(view.values()) == list(F_python.values())
+
+    # Ids that are not consecutive are looked up by search
+    subset = {fid: rec for fid, rec in F_python.items() if int(fid[1:]) % 3}
+    sparse = FlightView(FlightTable.from_dict(subset, FLEET))
+    assert dict(sparse) == subset
+    assert "D3" not in sparse
+
+
+def test_view_only_accepts_canonical_ids():
+    view = generate_flight_intentions(2, TIMING, engine="numpy")
+    assert "D1" in view
+    for fid in ("D01", "D+1", "D 1", "D１", "D", "1", 1):
+        assert fid not in view
+        with pytest.raises(KeyError):
+            view[fid]
@@ -0,0 +1,115 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from Instance_academic import (PATH_POLICIES, GridPathOracle, GridSpec, ImplicitGrid, build_grid_csr, create_graph,
+                               random_flight_templates)
+
+SPEC = GridSpec(rows=9, cols=8, edge_length=60.0)
+
+
+def _networkx_graph(spec, int_ids=False):
+    # The original create_graph, built from nx.grid_2d_graph
+    lattice = nx.grid_2d_graph(spec.rows, spec.cols)
+    G = nx.DiGraph() if spec.directed else nx.Graph()
+    G.graph["geo"] = False
+    coord_to_id = {}
+    for i, (r, c) in enumerate(lattice.nodes):
+        nid = i if int_ids else str(i)
+        coord_to_id[(r, c)] = nid
+        G.add_node(nid, x=r, y=c)
+    for u_coord, v_coord in lattice.edges:
+        u, v = coord_to_id[u_coord], coord_to_id[v_coord]
+        G.add_edge(u, v, length=spec.edge_length)
+        G.add_edge(v, u, length=spec.edge_length)
+    return coord_to_id, G
+
+
+@pytest.mark.parametrize("int_ids", [False, True])
+@pytest.mark.parametrize("spec", [SPEC, GridSpec(rows=5, cols=11, edge_length=2.5, directed=False),
+                                  GridSpec(rows=1, cols=4), GridSpec(rows=3, cols=1, directed=False)])
+def test_create_graph_matches_networkx(spec, int_ids):
+    coord_to_id, G = create_graph(spec, int_ids)
+    expected_coords, expected = _networkx_graph(spec, int_ids)
+    assert coord_to_id == expected_coords
+    assert type(G) is type(expected)
+    assert G.graph == expected.graph
+    assert list(G.nodes(data=True)) == list(expected.nodes(data=True))
+    assert nx.utils.edges_equal(G.edges(data="length"), expected.edges(data="length"))
+
+    csr = build_grid_csr(spec)
+    arcs = {(u, v, length) for u, v, length in zip(csr.sources().tolist(), csr.targets.tolist(),
+                                                 csr.length.tolist())}
+    # The CSR arrays hold both directions of every lattice edge, also for undirected specs
+    label = int if int_ids else str
+    assert {(label(u), label(v), length) for u, v, length in arcs} == {
+        (u, v, length) for u, v, length in nx.DiGraph(expected).edges(data="length")}
+
+
+def test_implicit_grid_matches_csr():
+    grid, csr = ImplicitGrid(SPEC), build_grid_csr(SPEC)
+    for u in range(grid.num_nodes):
+        assert grid.neighbors(u) == csr.targets[csr.offsets[u]:csr.offsets[u + 1]].tolist()
+
+
+def test_implicit_grid_accepts_numpy_ids():
+    grid, csr = ImplicitGrid(SPEC), build_grid_csr(SPEC)
+    u = csr.targets[0]
+    assert grid.coord(np.int64(5)) == (0, 5)
+    assert grid.neighbors(u) == grid.neighbors(int(u))
+    assert grid.manhattan(u, 3) == grid.manhattan(int(u), 3)
+    assert grid.has_arc(np.int32(0), np.int32(1))
+    assert grid.label(np.int64(7)) == "7"
+
+
+def test_implicit_grid_rejects_bools():
+    grid = ImplicitGrid(SPEC)
+    assert True not in grid
+    with pytest.raises(ValueError):
+        grid.coord(True)
+
+
+def test_random_templates_with_rare_long_pairs():
+    spec = GridSpec(rows=200, cols=150, edge_length=60.0)
+    longest = spec.rows + spec.cols - 2
+    templates = random_flight_templates(spec, 4, seed=1, min_length=longest - 1)
+    assert all(len(path) - 1 >= longest - 1 for _, path in templates.values())
+    assert templates == random_flight_templates(spec, 4, seed=1, min_length=longest - 1)
+
+
+def _assert_shortest(grid, u, v, path):
+    assert path[0] == u and path[-1] == v
+    assert len(path) == grid.manhattan(u, v) + 1
+    assert all(grid.has_arc(a, b) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("policy", PATH_POLICIES)
+@pytest.mark.parametrize("spec", [GridSpec(rows=17, cols=23), GridSpec(rows=1, cols=9), GridSpec(rows=6, cols=1)])
+def test_oracle_paths_are_shortest(spec, policy):
+    grid, oracle = ImplicitGrid(spec), GridPathOracle(spec)
+    rng = np.random.default_rng(0)
+    origins = rng.integers(grid.num_nodes, size=500)
+    destinations = rng.integers(grid.num_nodes, size=500)
+    destinations[:10] = origins[:10]
+    offsets, nodes = oracle.paths(origins, destinations, policy)
+    assert len(offsets) == len(origins) + 1
+    np.testing.assert_array_equal(np.diff(offsets) - 1, oracle.distances(origins, destinations))
+    for i, (u, v) in enumerate(zip(origins.tolist(), destinations.tolist())):
+        _assert_shortest(grid, u, v, nodes[offsets[i]:offsets[i + 1]].tolist())
+
+
+@pytest.mark.parametrize("winding", [0.0, 0.5, 1.0])
+def test_random_templates_are_shortest_paths(winding):
+    spec = GridSpec(rows=17, cols=23)
+    grid = ImplicitGrid(spec)
+    for _, path in random_flight_templates(spec, 200, seed=0, winding=winding, int_ids=True).values():
+        _assert_shortest(grid, path[0], path[-1], path)
+
+
+def test_rare_long_pairs_on_a_city_scale_grid():
+    # A (rows * cols) weight table would not fit in memory here
+    spec = GridSpec(rows=50_000, cols=40_000)
+    longest = spec.rows + spec.cols - 2
+    grid = ImplicitGrid(spec)
+    templates = random_flight_templates(spec, 2, seed=0, min_length=longest - 2, winding=0.0)
+    assert all(grid.manhattan(int(path[0]), int(path[-1])) >= longest - 2 for _, path in templates.values())
@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+from instance_profile import PROFILE_ENV, Profiler
+
+
+def test_enabled_profiler_records_stages():
+    profiler = Profiler(enabled=True)
+    with profiler.stage("generate") as stage:
+        stage.count(flights=10)
+        stage.count(flights=5, bytes=2.5)
+    with profiler.stage("save"):
+        pass
+
+    assert [s.name for s in profiler.stages] == ["generate", "save"]
+    generate = profiler.stages[0]
+    assert generate.seconds > 0
+    assert generate.counters == {"flights": 15, "bytes": 2.5}
+    assert generate.rate("flights") == pytest.approx(15 / generate.seconds)
+    assert generate.rate("missing") is None
+    assert [row["stage"] for row in profiler.as_dict()] == ["generate", "save"]
+    assert profiler.as_dict()[0]["flights"] == 15
+
+    out = io.StringIO()
+    profiler.report(out)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith("generate") and "flights=15" in lines[0] and "flights/s=" in lines[0]
+    assert lines[-1].startswith("total")
+
+
+def test_disabled_profiler_measures_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.stage("generate") as stage:
+        stage.count(flights=10)
+    assert profiler.stages == []
+    assert profiler.as_dict() == []
+    out = io.StringIO()
+    profiler.report(out)
+    assert out.getvalue() == ""
+
+
+@pytest.mark.parametrize("value, enabled", [(None, False), ("", False), ("0", False), ("1", True)])
+def test_enabled_defaults_to_environment(monkeypatch, value, enabled):
+    if value is None:
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(PROFILE_ENV, value)
+    assert Profiler().enabled is enabled
+    assert Profiler(enabled=not enabled).enabled is not enabled
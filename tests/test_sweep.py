@@ -0,0 +1,22 @@
+import json
+from dataclasses import replace
+
+from instance_sweep import DEFAULT_TIMING, MANIFEST_NAME, expand_sweep, run_sweep
+
+
+def _statuses(entries):
+    return {e["name"]: e["status"] for e in entries}
+
+
+def test_rerun_skips_only_unchanged_inputs(tmp_path):
+    points = expand_sweep({"repetitions": [1, 2]}, DEFAULT_TIMING, min_sep=28)
+    assert set(_statuses(run_sweep(points, tmp_path, workers=1)).values()) == {"generated"}
+    assert set(_statuses(run_sweep(points, tmp_path, workers=1)).values()) == {"skipped"}
+
+    changed = expand_sweep({"repetitions": [1, 2]}, replace(DEFAULT_TIMING, v_max=20.0), min_sep=5)
+    assert set(_statuses(run_sweep(changed, tmp_path, workers=1)).values()) == {"generated"}
+    instance = json.loads((tmp_path / "repetitions=1.json").read_text(encoding="utf-8"))
+    assert instance["TimingParams"]["P0"]["v_max"] == 20.0
+    assert set(instance["Sep_Nodes"].values()) == {5}
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert {e["timing"]["v_max"] for e in manifest["instances"]} == {20.0}